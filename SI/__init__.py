@@ -1,6 +1,38 @@
+import os
+
 from .unit import Unit
 from .quantity import Quantity
 from .constants import Constants
 from .unitsystem import UnitSystem
+from .convert import convert_stream, convert_csv
+from .formula import compile_formula
+
+__all__ = ["Unit", "Quantity", "Constants", "UnitSystem", "QuantityArray",
+           "convert_stream", "convert_csv", "compile_formula",
+           "BatchExecutor", "convert_batch", "evaluate_batch",
+           "QuantityWriter", "save_quantities", "load_quantities", "checked"]
+
+if os.environ.get("SI_PROFILE"):
+    from . import profiling
+    profiling._enable_from_env(os.environ)
+
+# 首次使用时才导入的名字: {名字: 子模块}，
+# 避免 numpy、multiprocessing 拖慢 import SI
+_LAZY = {
+    "QuantityArray": "array",
+    "BatchExecutor": "parallel",
+    "convert_batch": "parallel",
+    "evaluate_batch": "parallel",
+    "QuantityWriter": "storage",
+    "save_quantities": "storage",
+    "load_quantities": "storage",
+    "checked": "checks",
+}
+
 
-__all__ = ["Unit", "Quantity", "Constants", "UnitSystem"]
\ No newline at end of file
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    return getattr(import_module(f".{module}", __name__), name)
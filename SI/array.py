@@ -0,0 +1,209 @@
+from .unit import Unit
+from .quantity import Quantity
+
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖，只有 QuantityArray 需要
+    np = None
+
+
+class QuantityArray(Quantity):
+    """
+    共享同一单位的一组物理量，数值存放在 numpy 数组中
+    单位运算和换算因子每次运算只计算一次，数值部分为一次向量化计算
+    """
+    __slots__ = ()
+
+    # 让 numpy 把 ndarray 与 QuantityArray 的运算交给下面的反向运算符
+    __array_ufunc__ = None
+
+    def __init__(self, value, unit, copy=False):
+        if np is None:
+            raise ImportError("QuantityArray requires numpy")
+        if not isinstance(unit, Unit):
+            unit = Unit(unit)
+        value = np.array(value, dtype=float) if copy else np.asarray(value, dtype=float)
+        Quantity.__init__(self, value, unit)
+
+    def __reduce__(self):
+        return (QuantityArray, (self.value, self.unit))
+
+    @classmethod
+    def from_quantities(cls, quantities, unit=None):
+        """由一组 Quantity 构造，统一换算到 unit (默认为第一个元素的单位)"""
+        quantities = list(quantities)
+        if unit is None:
+            if not quantities:
+                raise ValueError("Cannot infer unit from an empty sequence")
+            unit = quantities[0].unit
+        elif not isinstance(unit, Unit):
+            unit = Unit(unit)
+        # 每种来源单位只计算一次换算因子
+        factors = {}
+        values = np.empty(len(quantities))
+        for i, q in enumerate(quantities):
+            factor = factors.get(q.unit.name)
+            if factor is None:
+                factor = factors[q.unit.name] = q.unit.convert_to(unit)
+            values[i] = q.value * factor
+        return cls(values, unit)
+
+    @staticmethod
+    def _split(other):
+        """拆成 (数值, 单位)，纯数值或 ndarray 的单位为 None"""
+        if isinstance(other, Quantity):
+            return other.value, other.unit
+        if isinstance(other, Unit):
+            return 1.0, other
+        return other, None
+
+    def _converted(self, other, action):
+        """把 other 换算到 self 的单位，返回其数值"""
+        value, unit = self._split(other)
+        if unit is None:
+            unit = Unit('1')
+        if not unit.is_compatible(self.unit):
+            raise ValueError(f"Unit {self.unit} & {unit} can't be {action}")
+        factor = unit.convert_to(self.unit)
+        return value if factor == 1 else value * factor
+
+    def _in_unit(self, unit, action):
+        """self 换算到 unit 后的数值"""
+        if not unit.is_compatible(self.unit):
+            raise ValueError(f"Unit {unit} & {self.unit} can't be {action}")
+        factor = self.unit.convert_to(unit)
+        return self.value if factor == 1 else self.value * factor
+
+    def to_derived_unit(self):
+        factor, dunit = self.unit.to_derived_unit()
+        return QuantityArray(self.value * factor, dunit)
+
+    def to(self, target_unit):
+        if not isinstance(target_unit, Unit):
+            target_unit = Unit(target_unit)
+        conversion_factor = self.unit.convert_to(target_unit)
+        return QuantityArray(self.value * conversion_factor, target_unit)
+
+    def to_engineering(self):
+        """每个元素各自选择词头，返回 Quantity 列表，词头的选择为一次向量化计算"""
+        from .engineering import engineering_array
+        values, units = engineering_array(self.value, self.unit)
+        return [Quantity(v, u) for v, u in zip(values.ravel().tolist(), units)]
+
+    def __mul__(self, other):
+        value, unit = self._split(other)
+        if unit is None:
+            return QuantityArray(self.value * value, self.unit)
+        factor, dunit = (self.unit * unit).to_derived_unit()
+        return QuantityArray(self.value * value * factor, dunit)
+
+    def __rmul__(self, other):
+        value, unit = self._split(other)
+        if unit is None:
+            return QuantityArray(value * self.value, self.unit)
+        factor, dunit = (unit * self.unit).to_derived_unit()
+        return QuantityArray(value * self.value * factor, dunit)
+
+    def __truediv__(self, other):
+        value, unit = self._split(other)
+        if unit is None:
+            return QuantityArray(self.value / value, self.unit)
+        factor, dunit = (self.unit / unit).to_derived_unit()
+        return QuantityArray(self.value / value * factor, dunit)
+
+    def __rtruediv__(self, other):
+        value, unit = self._split(other)
+        if unit is None:
+            return QuantityArray(value / self.value, self.unit ** -1)
+        factor, dunit = (unit / self.unit).to_derived_unit()
+        return QuantityArray(value / self.value * factor, dunit)
+
+    def __pow__(self, power):
+        return QuantityArray(self.value ** power, self.unit ** power)
+
+    def __add__(self, other):
+        return QuantityArray(self.value + self._converted(other, "added"), self.unit)
+
+    def __radd__(self, other):
+        # 与 Quantity 一致，结果取左操作数的单位
+        value, unit = self._split(other)
+        if unit is None:
+            return QuantityArray(self._converted(other, "added") + self.value, self.unit)
+        return QuantityArray(value + self._in_unit(unit, "added"), unit)
+
+    def __sub__(self, other):
+        return QuantityArray(self.value - self._converted(other, "substracted"), self.unit)
+
+    def __rsub__(self, other):
+        value, unit = self._split(other)
+        if unit is None:
+            return QuantityArray(self._converted(other, "substracted") - self.value, self.unit)
+        return QuantityArray(value - self._in_unit(unit, "substracted"), unit)
+
+    def __neg__(self):
+        return QuantityArray(-self.value, self.unit)
+
+    def __abs__(self):
+        return QuantityArray(np.abs(self.value), self.unit)
+
+    # 比较运算返回布尔数组
+    def __eq__(self, other):
+        return self.value == self._converted(other, "compared")
+
+    def __ne__(self, other):
+        return self.value != self._converted(other, "compared")
+
+    def __lt__(self, other):
+        return self.value < self._converted(other, "compared")
+
+    def __le__(self, other):
+        return self.value <= self._converted(other, "compared")
+
+    def __gt__(self, other):
+        return self.value > self._converted(other, "compared")
+
+    def __ge__(self, other):
+        return self.value >= self._converted(other, "compared")
+
+    __hash__ = None
+
+    # 归约运算返回 Quantity
+    def sum(self, axis=None):
+        return self._reduced(self.value.sum(axis=axis))
+
+    def mean(self, axis=None):
+        return self._reduced(self.value.mean(axis=axis))
+
+    def min(self, axis=None):
+        return self._reduced(self.value.min(axis=axis))
+
+    def max(self, axis=None):
+        return self._reduced(self.value.max(axis=axis))
+
+    def _reduced(self, value):
+        if np.ndim(value):
+            return QuantityArray(value, self.unit)
+        return Quantity(float(value), self.unit)
+
+    def __getitem__(self, index):
+        return self._reduced(self.value[index])
+
+    def __len__(self):
+        return len(self.value)
+
+    def __iter__(self):
+        for value in self.value:
+            yield Quantity(float(value), self.unit)
+
+    @property
+    def shape(self):
+        return self.value.shape
+
+    def __str__(self):
+        values = np.array2string(np.round(self.value, 6))
+        if self.unit.name == '1':
+            return values
+        return f"{values} {self.unit.name}"
+
+    def __repr__(self):
+        return f"QuantityArray({self.value!r}, {self.unit!r})"
@@ -0,0 +1,91 @@
+from collections import OrderedDict, namedtuple
+# 直接用 _thread 的锁，避免导入 threading 拖慢 import SI
+from _thread import allocate_lock
+
+# 缓存统计信息
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+
+class LRUCache:
+    """
+    线程安全的有界 LRU 缓存，记录命中、未命中和淘汰次数(并发时为近似值)
+    maxsize 为 None 时不限大小，为 0 时不缓存
+    """
+    def __init__(self, maxsize=1024):
+        self._data = OrderedDict()
+        self._lock = allocate_lock()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # 缓存内容所依赖的数据版本，见 validate()
+        self.version = None
+
+    def validate(self, version):
+        """
+        数据版本变化时丢弃全部条目(保留统计)
+        版本号只增不减: 读到旧版本的线程不会把缓存退回旧版本
+        """
+        if version != self.version:
+            with self._lock:
+                if self.version is None or version > self.version:
+                    self._data.clear()
+                    self.version = version
+
+    def get(self, key, default=None):
+        # 读取不加锁: OrderedDict 的单个操作在 GIL 下是原子的，
+        # 与并发淘汰交错时最多把一次命中记为未命中
+        try:
+            value = self._data[key]
+            self._data.move_to_end(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def put(self, key, value, version=None):
+        """
+        version 为计算 value 之前读到的数据版本，与缓存当前版本不同时丢弃这次写入，
+        以免计算期间发布的新版本数据被旧结果污染
+        """
+        with self._lock:
+            if self.maxsize == 0 or (version is not None and version != self.version):
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        if self.maxsize is None:
+            return
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize):
+        """修改缓存容量，超出部分按最久未使用顺序淘汰"""
+        if maxsize is not None and maxsize < 0:
+            raise ValueError(f"Cache size must be >= 0 or None, got {maxsize}")
+        with self._lock:
+            self.maxsize = maxsize
+            if maxsize == 0:
+                self.evictions += len(self._data)
+                self._data.clear()
+            self._evict()
+
+    def clear(self):
+        """清空缓存并重置统计"""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
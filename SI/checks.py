@@ -0,0 +1,155 @@
+"""
+检查参数和返回值量纲的函数装饰器
+
+    @checked(d="m", t="s", returns="m/s")
+    def speed(d, t):
+        return d / t
+
+    speed(Quantity(3, "km"), Quantity(2, "min"))   # 参数换算为 m 和 s 后调用，结果换算为 m/s
+
+每种参数单位的组合(签名)只检查一次量纲并缓存换算因子，之后的调用只多一次字典查找；
+strict=True 时每次调用都重新检查，用于调试。
+未声明单位的参数不检查；纯数值视为无量纲，只能用于无量纲的参数和返回值。
+"""
+from functools import wraps
+
+from .unit import Unit
+
+# 每个被检查函数最多缓存的签名数，超出时清空重建
+_PLAN_CACHE_SIZE = 256
+# 缓存未命中时的返回值，与换算因子 None(不需要换算)区分
+_MISSING = object()
+
+
+class _Default:
+    """未传入(使用默认值)的参数，unit 为自身，以区别于 unit 为 None 的纯数值"""
+
+
+_Default.unit = _Default
+
+
+def _describe(unit):
+    return "a plain number" if unit is None else str(unit)
+
+
+def _factor(what, unit, declared):
+    """unit 换算到声明单位的因子，不需要换算时为 None；量纲不符时抛出 ValueError"""
+    if unit is None:
+        if declared.dim != Unit('1').dim:
+            raise ValueError(f"{what} must be in {declared}, got a plain number")
+        return None
+    if unit.dim != declared.dim:
+        raise ValueError(f"{what} must be in {declared}, got {_describe(unit)}")
+    factor = Unit.converter(unit, declared).factor
+    return None if factor == 1 else factor
+
+
+def _store(cache, key, value):
+    # 只在未命中时调用，命中路径不做任何额外工作
+    if len(cache) >= _PLAN_CACHE_SIZE:
+        cache.clear()
+    cache[key] = value
+
+
+class _Checker:
+    def __init__(self, func, units, returns, strict):
+        import inspect
+        params = inspect.signature(func).parameters
+        # 声明单位的参数: (参数名, 位置下标或 None, 声明单位)
+        slots = []
+        for name, unit in units.items():
+            param = params.get(name)
+            if param is None or param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                raise TypeError(f"{func.__name__}() has no argument {name!r}")
+            position = list(params).index(name) if param.kind in (
+                param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD) else None
+            slots.append((name, position, unit if isinstance(unit, Unit) else Unit(unit)))
+        self.func = func
+        self.slots = tuple(slots)
+        self.positions = tuple(position for _, position, _ in slots)
+        self.returns = returns if returns is None or isinstance(returns, Unit) else Unit(returns)
+        self.strict = strict
+        # {参数单位的组合: ((参数名, 位置下标, 换算因子, 声明单位), ...)}，只记录需要换算的参数；
+        # 按单位本身作键，相等的单位(量纲和换算因子相同)共用一个条目
+        self.plans = {}
+        # {返回值单位: 换算因子}
+        self.result_factors = {}
+
+    def _plan(self, units):
+        plan = []
+        func = self.func.__name__
+        for (name, position, declared), unit in zip(self.slots, units):
+            if unit is _Default:
+                continue
+            factor = _factor(f"Argument {name} of {func}()", unit, declared)
+            if factor is not None:
+                plan.append((name, position, factor, declared))
+        return tuple(plan)
+
+    def _result(self, result):
+        unit = getattr(result, 'unit', None)
+        factor = _MISSING if self.strict else self.result_factors.get(unit, _MISSING)
+        if factor is _MISSING:
+            factor = _factor(f"Result of {self.func.__name__}()", unit, self.returns)
+            _store(self.result_factors, unit, factor)
+        if factor is None:
+            return result
+        return type(result)(result.value * factor, self.returns)
+
+    def _units(self, args, kwargs):
+        n = len(args)
+        return tuple([getattr(args[position] if position is not None and position < n
+                              else kwargs.get(name, _Default), 'unit', None)
+                      for name, position, _ in self.slots])
+
+    def __call__(self, args, kwargs):
+        units = self._units(args, kwargs)
+        plan = None if self.strict else self.plans.get(units)
+        if plan is None:
+            plan = self._plan(units)
+            _store(self.plans, units, plan)
+        if plan:
+            args = list(args)
+            for name, position, factor, declared in plan:
+                if position is not None and position < len(args):
+                    q = args[position]
+                    args[position] = type(q)(q.value * factor, declared)
+                else:
+                    q = kwargs[name]
+                    kwargs[name] = type(q)(q.value * factor, declared)
+        result = self.func(*args, **kwargs)
+        if self.returns is None:
+            return result
+        return self._result(result)
+
+
+def checked(returns=None, strict=False, **units):
+    """
+    装饰器: 检查声明了单位的参数(及返回值)的量纲
+        @checked(d="m", t="s", returns="m/s")
+    Quantity 参数换算到声明的单位后传入(同单位时原样传入)，返回值换算到 returns；
+    量纲不符时抛出 ValueError
+    """
+    def decorate(func):
+        checker = _Checker(func, units, returns, strict)
+        plans, positions, result_factors = checker.plans, checker.positions, checker.result_factors
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # 常见情形: 声明单位的参数都是按位置传入的 Quantity，且该签名不需要换算
+            if not strict and not kwargs:
+                try:
+                    plan = plans.get(tuple([args[p].unit for p in positions]))
+                except (AttributeError, IndexError, TypeError):
+                    plan = None
+                if plan is not None and not plan:
+                    result = func(*args)
+                    if returns is None:
+                        return result
+                    if result_factors.get(getattr(result, 'unit', None), _MISSING) is None:
+                        return result
+                    return checker._result(result)
+            return checker(args, kwargs)
+        wrapper.checker = checker
+        return wrapper
+    return decorate
@@ -1,18 +1,37 @@
 from .quantity import Quantity
 from .unit import Unit
 
+
+class _Constant:
+    """
+    惰性物理常数: 首次访问时才解析单位并构造 Quantity，
+    之后用构造结果替换类属性，再次访问就是普通的属性读取
+    """
+    def __init__(self, value, unit):
+        self.value = value
+        self.unit = unit
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        quantity = Quantity(self.value, Unit(self.unit))
+        setattr(owner, self.name, quantity)
+        return quantity
+
+
 class Constants:
     # 常用物理常数
-    g = Quantity(9.80665, Unit('m/s^2'))  # 重力加速度
-    h = Quantity(6.62607015e-34, Unit('J·s'))  # 普朗克常数
-    c = Quantity(299792458, Unit('m/s'))  # 光速
-    m_e = Quantity(9.10938356e-31, Unit('kg'))  # 电子质量
-    m_p = Quantity(1.6726219e-27, Unit('kg'))  # 质子质量
-    m_n = Quantity(1.6749286e-27, Unit('kg'))  # 中子质量
-    alpha = Quantity(7.2973525693e-3, Unit('1'))  # 精细结构常数
-    N_A = Quantity(6.02214076e23, Unit('1/mol'))  # 阿伏伽德罗常数
-    R = Quantity(8.314462618, Unit('J/(mol·K)'))  # 理想气体常数
-    k_B = Quantity(1.380649e-23, Unit('J/K'))  # 玻尔兹曼常数
-    epsilon_0 = Quantity(8.854187817e-12, Unit('F/m'))  # 真空介电常数
-    mu_0 = Quantity(1.256637062e-6, Unit('H/m'))  # 真空磁导率
-    e = Quantity(1.602176634e-19, Unit('C'))  # 元电荷
\ No newline at end of file
+    g = _Constant(9.80665, 'm/s^2')  # 重力加速度
+    h = _Constant(6.62607015e-34, 'J·s')  # 普朗克常数
+    c = _Constant(299792458, 'm/s')  # 光速
+    m_e = _Constant(9.10938356e-31, 'kg')  # 电子质量
+    m_p = _Constant(1.6726219e-27, 'kg')  # 质子质量
+    m_n = _Constant(1.6749286e-27, 'kg')  # 中子质量
+    alpha = _Constant(7.2973525693e-3, '1')  # 精细结构常数
+    N_A = _Constant(6.02214076e23, '1/mol')  # 阿伏伽德罗常数
+    R = _Constant(8.314462618, 'J/(mol·K)')  # 理想气体常数
+    k_B = _Constant(1.380649e-23, 'J/K')  # 玻尔兹曼常数
+    epsilon_0 = _Constant(8.854187817e-12, 'F/m')  # 真空介电常数
+    mu_0 = _Constant(1.256637062e-6, 'H/m')  # 真空磁导率
+    e = _Constant(1.602176634e-19, 'C')  # 元电荷
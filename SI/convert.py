@@ -0,0 +1,81 @@
+from .unit import Unit
+from .quantity import Quantity
+import itertools
+
+
+class _FactorTable(dict):
+    """
+    {来源单位: 换算到目标单位的因子}
+    每种来源单位只解析、检查兼容性并计算一次因子
+    """
+    def __init__(self, target):
+        super().__init__()
+        self.target = target if isinstance(target, Unit) else Unit(target)
+
+    def __missing__(self, unit):
+        factor = self[unit] = Unit.converter(unit, self.target).factor
+        return factor
+
+
+def _converted(rows, factors):
+    for row in rows:
+        if isinstance(row, Quantity):
+            yield row.value * factors[row.unit]
+        else:
+            value, unit = row
+            yield float(value) * factors[unit]
+
+
+def _chunked(values, chunk_size, as_array):
+    if as_array:
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("as_array=True requires numpy") from None
+    while True:
+        chunk = list(itertools.islice(values, chunk_size))
+        if not chunk:
+            return
+        yield np.array(chunk, dtype=float) if as_array else chunk
+
+
+def convert_stream(rows, target, chunk_size=None, as_array=False):
+    """
+    流式换算一组数据到目标单位，内存占用与数据量无关
+    rows 的元素为 (数值, 单位) 或 Quantity，如 [(3, 'mm'), (2, 'inch')]
+    默认逐个生成换算后的数值；给出 chunk_size 时按批生成列表，
+    as_array=True 时按批生成 numpy 数组
+    """
+    values = _converted(rows, _FactorTable(target))
+    if chunk_size is None:
+        if as_array:
+            raise ValueError("as_array=True requires chunk_size")
+        return values
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    return _chunked(values, chunk_size, as_array)
+
+
+def convert_csv(source, target, value_column=0, unit_column=1, header=False,
+                chunk_size=None, as_array=False, **reader_options):
+    """
+    流式换算 CSV 中的 (数值, 单位) 两列到目标单位
+    source 为文件路径或已打开的文本文件；列可用下标，有表头时也可用列名
+    其余参数同 convert_stream，reader_options 传给 csv.reader (如 delimiter)
+    """
+    if isinstance(source, str):
+        with open(source, newline='') as f:
+            yield from convert_csv(f, target, value_column, unit_column, header,
+                                   chunk_size, as_array, **reader_options)
+        return
+
+    import csv
+    reader = csv.reader(source, **reader_options)
+    if header or isinstance(value_column, str) or isinstance(unit_column, str):
+        names = next(reader, [])
+        if isinstance(value_column, str):
+            value_column = names.index(value_column)
+        if isinstance(unit_column, str):
+            unit_column = names.index(unit_column)
+    rows = ((row[value_column], row[unit_column]) for row in reader if row)
+    yield from convert_stream(rows, target, chunk_size, as_array)
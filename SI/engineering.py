@@ -0,0 +1,147 @@
+"""
+自动选择词头(工程记数法): 0.00005 A -> 50 uA，15000 Ohm -> 15 kOhm
+
+    Quantity(0.00005, "A").to_engineering()       # 50.0 uA
+    QuantityArray(values, "Ohm").to_engineering()  # 每个元素各自选择词头的 Quantity 列表
+
+加词头的基准单位按以下顺序确定:
+    UnitSystem.set_preferred_unit 为该量纲设置的单位
+    单位本身是单个符号时去掉词头的符号(keV -> eV，kg -> g 见 UnitSystem.PREFIX_BASES)
+    该量纲的命名单位(N*m -> J)
+都没有时(如 km/h、无量纲)保持原单位不变；基准单位在 UnitSystem.UNPREFIXED_UNITS 中或为英制单位时只换算不加词头。
+只使用 UnitSystem.PREFIXES 中 10 的 3k 次方的词头。每个基准单位预先生成一张按 floor(log10|数值|) 查词头的表，
+选择词头时不做试探换算，也不解析单位。
+"""
+import math
+
+from .cache import LRUCache
+from .unit import Unit
+from .unitsystem import UnitSystem
+
+# {id(来源单位): (来源单位, 换算计划)}，换算计划为 (到基准单位的因子, 词头表)，不换算时为 None
+_PLANS = LRUCache(maxsize=256)
+# {基准单位名: 词头表}
+_TABLES = LRUCache(maxsize=256)
+
+
+class _PrefixTable:
+    """
+    基准单位的词头表: 第 i 项对应 floor(log10|数值|) == low + i，超出范围时取两端
+    数值乘 mul 再除以 div 得到带词头单位下的数值，mul、div 都是精确的 10 的整数次方
+    """
+    __slots__ = ('low', 'mul', 'div', 'units')
+
+    def __init__(self, root):
+        reg = UnitSystem._registry
+        base = Unit(root)
+        choices = {0: base}
+        if root not in UnitSystem.UNPREFIXED_UNITS and root not in reg.english:
+            for prefix, factor in reg.prefixes.items():
+                exp = round(math.log10(factor))
+                if exp == 0 or exp % 3 or not math.isclose(factor, 10.0 ** exp):
+                    continue
+                try:
+                    unit = Unit(prefix + root)
+                except ValueError:
+                    continue
+                # 词头与基准单位拼成的符号可能是另一个单位(如 'm' + 'in')
+                if unit.dim == base.dim and math.isclose(unit.factor, factor * base.factor):
+                    choices.setdefault(exp, unit)
+        exps = sorted(choices)
+        # 最大的词头之上留出两位，使 1000 倍以内的数值仍在表内
+        self.low = exps[0]
+        self.mul, self.div, self.units = [], [], []
+        i = 0
+        for e in range(exps[0], exps[-1] + 3):
+            while i + 1 < len(exps) and exps[i + 1] <= e:
+                i += 1
+            exp = exps[i]
+            self.mul.append(10.0 ** -exp if exp < 0 else 1.0)
+            self.div.append(10.0 ** exp if exp > 0 else 1.0)
+            self.units.append(choices[exp])
+
+    def index(self, value):
+        if value == 0 or not math.isfinite(value):
+            return -self.low
+        i = math.floor(math.log10(abs(value))) - self.low
+        return 0 if i < 0 else min(i, len(self.units) - 1)
+
+
+def _unprefixed(reg, name):
+    """单个符号去掉词头后的单位名，不是单位表中的单位加词头时原样返回"""
+    def known(symbol):
+        return symbol in reg.derived or symbol in reg.english or symbol in UnitSystem.BASE_UNITS
+    if known(name):
+        return name
+    for prefix, _ in reg.sorted_prefixes:
+        if name.startswith(prefix) and known(name[len(prefix):]):
+            return name[len(prefix):]
+    return name
+
+
+def _root(unit):
+    """unit 所在量纲加词头的基准单位名，没有时返回 None"""
+    reg = UnitSystem._registry
+    root = reg.preferred.get(unit.dim)
+    if root is None:
+        name = unit.name
+        if name.isalpha():
+            root = _unprefixed(reg, name)
+        else:
+            match = UnitSystem.find_derived_unit(unit.dim)
+            root = match[1] if match is not None and match[1] != '1' else None
+    return UnitSystem.PREFIX_BASES.get(root, root)
+
+
+def _table(root, version):
+    table = _TABLES.get(root)
+    if table is None:
+        table = _PrefixTable(root)
+        _TABLES.put(root, table, version)
+    return table
+
+
+def plan(unit):
+    """来源单位的换算计划 (到基准单位的因子, 词头表)，不加词头时为 None"""
+    version = UnitSystem._version
+    _PLANS.validate(version)
+    _TABLES.validate(version)
+    entry = _PLANS.get(id(unit))
+    if entry is None:
+        root = _root(unit)
+        entry = (unit, None if root is None else (Unit.converter(unit, Unit(root)).factor, _table(root, version)))
+        _PLANS.put(id(unit), entry, version)
+    return entry[1]
+
+
+def engineering(value, unit):
+    """标量: 返回 (带词头单位下的数值, 单位)"""
+    p = plan(unit)
+    if p is None:
+        return value, unit
+    factor, table = p
+    value = value * factor
+    i = table.index(value)
+    return value * table.mul[i] / table.div[i], table.units[i]
+
+
+def engineering_array(values, unit):
+    """
+    数组: 返回 (带词头单位下的数值数组, 各元素的单位列表)
+    词头下标由一次向量化的 log10 计算得到
+    """
+    import numpy as np
+    values = np.asarray(values, dtype=float)
+    p = plan(unit)
+    if p is None:
+        return values, [unit] * values.size
+    factor, table = p
+    values = values * factor
+    magnitude = np.abs(values)
+    finite = np.isfinite(magnitude) & (magnitude > 0)
+    exps = np.floor(np.log10(np.where(finite, magnitude, 1.0))).astype(np.int64)
+    index = np.clip(exps - table.low, 0, len(table.units) - 1)
+    index[~finite] = table.index(0.0)
+    scaled = values * np.asarray(table.mul)[index] / np.asarray(table.div)[index]
+    units = table.units
+    return scaled, [units[i] for i in index.ravel().tolist()]
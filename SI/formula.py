@@ -0,0 +1,214 @@
+from .unit import Unit
+from .quantity import Quantity
+from .unitsystem import UnitSystem
+
+
+def _dim_name(dim):
+    return UnitSystem.units_to_string(UnitSystem.from_dimension(dim))
+
+
+class _Symbol(Quantity):
+    """
+    编译公式时代替输入的符号量: 只记录量纲、基本单位下的比例系数和对应的 Python 表达式
+    实际值(基本单位) = scale * eval(code)，code 为 None 表示常数
+    继承 Quantity 是为了让 Quantity 与它运算时优先调用下面的反向运算符
+    """
+    __slots__ = ('code', 'dim', 'scale')
+
+    def __init__(self, code, dim, scale=1.0):
+        setattr_ = object.__setattr__
+        setattr_(self, 'code', code)
+        setattr_(self, 'dim', dim)
+        setattr_(self, 'scale', scale)
+
+    @staticmethod
+    def of(operand):
+        if isinstance(operand, _Symbol):
+            return operand
+        if isinstance(operand, Quantity):
+            # 常数(如 Constants.c)直接折算到基本单位
+            return _Symbol(None, operand.unit.dim, operand.value * operand.unit.factor)
+        if isinstance(operand, Unit):
+            return _Symbol(None, operand.dim, operand.factor)
+        if isinstance(operand, (int, float)):
+            return _Symbol(None, UnitSystem.DIMENSIONLESS, operand)
+        raise TypeError(f"Unsupported operand in formula: {operand!r}")
+
+    @staticmethod
+    def _join(a, op, b):
+        if a.code is None:
+            return b.code if op == '*' or b.code is None else f"(1/{b.code})"
+        if b.code is None:
+            return a.code
+        return f"({a.code}{op}{b.code})"
+
+    def _mul(self, other, sign):
+        a, b = self, other
+        if sign > 0:
+            dim = tuple(x + y for x, y in zip(a.dim, b.dim))
+            scale = a.scale * b.scale
+        else:
+            dim = tuple(x - y for x, y in zip(a.dim, b.dim))
+            scale = a.scale / b.scale
+        return _Symbol(self._join(a, '*' if sign > 0 else '/', b), UnitSystem.intern_dimension(dim), scale)
+
+    def _add(self, other, sign, action):
+        a, b = self, other
+        if a.dim != b.dim:
+            raise ValueError(f"Unit {_dim_name(a.dim)} & {_dim_name(b.dim)} can't be {action}")
+        op = '+' if sign > 0 else '-'
+        # 两边按 a 的比例系数对齐，b 的比例差异写成字面常数
+        if b.code is None:
+            rhs = repr(b.scale / a.scale)
+        elif b.scale == a.scale:
+            rhs = b.code
+        else:
+            rhs = f"{b.code}*{b.scale / a.scale!r}"
+        lhs = a.code if a.code is not None else '1'
+        if a.code is None and b.code is None:
+            return _Symbol(None, a.dim, a.scale + sign * b.scale)
+        return _Symbol(f"({lhs}{op}{rhs})", a.dim, a.scale)
+
+    def __mul__(self, other):
+        return self._mul(_Symbol.of(other), 1)
+
+    def __rmul__(self, other):
+        return _Symbol.of(other)._mul(self, 1)
+
+    def __truediv__(self, other):
+        return self._mul(_Symbol.of(other), -1)
+
+    def __rtruediv__(self, other):
+        return _Symbol.of(other)._mul(self, -1)
+
+    def __add__(self, other):
+        return self._add(_Symbol.of(other), 1, "added")
+
+    def __radd__(self, other):
+        return _Symbol.of(other)._add(self, 1, "added")
+
+    def __sub__(self, other):
+        return self._add(_Symbol.of(other), -1, "substracted")
+
+    def __rsub__(self, other):
+        return _Symbol.of(other)._add(self, -1, "substracted")
+
+    def __neg__(self):
+        return self * -1
+
+    def __pos__(self):
+        return self
+
+    def __pow__(self, power):
+        if not isinstance(power, (int, float)):
+            raise TypeError(f"Exponent must be a number, got {power!r}")
+        dim = UnitSystem.intern_dimension(tuple(x * power for x in self.dim))
+        code = None if self.code is None else f"({self.code}**{power!r})"
+        return _Symbol(code, dim, self.scale ** power)
+
+
+def _sqrt(x):
+    return _Symbol.of(x) ** 0.5
+
+
+class CompiledFormula:
+    """
+    单位检查和化简已完成的公式，调用时只做浮点(或 numpy 数组)运算
+        P = compile_formula("V**2 / R", V="V", R="kOhm")
+        P(V=10, R=50)        # Quantity(0.002, W)
+        P.kernel(10, 50)     # 0.002，输入输出都是声明单位下的裸数值
+    """
+    def __init__(self, names, units, unit, kernel, source, spec=None):
+        self.names = names
+        self.units = units
+        self.unit = unit
+        self.kernel = kernel
+        self.source = source
+        # 由表达式字符串编译时为 (表达式, 输出单位, ((输入名, 单位或常数), ...))，
+        # 可在其它进程中据此重新编译，见 parallel.py
+        self.spec = spec
+
+    def _bind(self, args, kwargs):
+        values = list(args)
+        for name in self.names[len(args):]:
+            try:
+                values.append(kwargs.pop(name))
+            except KeyError:
+                raise TypeError(f"Missing formula argument: {name}") from None
+        if kwargs or len(values) > len(self.names):
+            raise TypeError(f"Formula takes arguments ({', '.join(self.names)})")
+        return values
+
+    def __call__(self, *args, **kwargs):
+        """参数为声明单位下的数值或任意兼容单位的 Quantity，返回带输出单位的结果"""
+        if kwargs or len(args) != len(self.names):
+            args = self._bind(args, kwargs)
+        result = self.kernel(*[Unit.converter(v.unit, u)(v.value) if isinstance(v, Quantity) else v
+                               for v, u in zip(args, self.units.values())])
+        if not isinstance(result, (float, int)) and getattr(result, 'ndim', 0):
+            from .array import QuantityArray
+            return QuantityArray(result, self.unit)
+        return Quantity(result, self.unit)
+
+    def __repr__(self):
+        inputs = ", ".join(f"{n}[{u.name}]" for n, u in self.units.items())
+        return f"CompiledFormula(({inputs}) -> {self.unit.name}: {self.source})"
+
+
+def compile_formula(formula, returns=None, **units):
+    """
+    编译公式: 单位运算只做一次，返回 CompiledFormula
+    formula 为表达式字符串(可用 sqrt、pi 和 Constants)或以输入名为参数的函数，
+    units 给出各输入的单位，returns 为输出单位(默认取量纲对应的导出单位)
+        compile_formula("d / c * n", d="m", n="1", c=Constants.c)    # 常数也可作为输入名
+        compile_formula(lambda V, R: V**2 / R, V="V", R="Ohm", returns="mW")
+    """
+    import math
+    from .constants import Constants   # 避免循环导入
+
+    names = tuple(units)
+    symbols = {}
+    input_units = {}
+    for i, name in enumerate(names):
+        given = units[name]
+        if isinstance(given, Quantity):
+            # 直接给出常数值的输入
+            symbols[name] = _Symbol.of(given)
+            continue
+        unit = given if isinstance(given, Unit) else Unit(given)
+        input_units[name] = unit
+        symbols[name] = _Symbol(f"x{i}", unit.dim, unit.factor)
+
+    if isinstance(formula, str):
+        namespace = {"sqrt": _sqrt, "pi": math.pi, "Constants": Constants, **symbols}
+        result = eval(formula, {"__builtins__": {}}, namespace)
+        source = formula
+    else:
+        result = formula(**symbols)
+        source = getattr(formula, "__name__", repr(formula))
+    result = _Symbol.of(result)
+
+    if returns is None:
+        match = UnitSystem.find_derived_unit(result.dim)
+        name = match[1] if match else _dim_name(result.dim)
+        unit = Unit(name)
+    else:
+        unit = returns if isinstance(returns, Unit) else Unit(returns)
+        if unit.dim != result.dim:
+            raise ValueError(f"Formula result {_dim_name(result.dim)} is incompatible with {unit}")
+
+    # 输入单位、常数和输出单位的比例系数合并为一个常数
+    factor = result.scale / unit.factor
+    args = ", ".join(f"x{i}" for i, name in enumerate(names) if name in input_units)
+    if result.code is None:
+        body = repr(factor)
+    elif factor == 1:
+        body = result.code
+    else:
+        body = f"{result.code}*{factor!r}"
+    kernel = eval(f"lambda {args}: {body}", {"__builtins__": {}})
+    spec = None
+    if isinstance(formula, str):
+        spec = (formula, unit.name,
+                tuple((name, u.name if isinstance(u, Unit) else u) for name, u in units.items()))
+    return CompiledFormula(tuple(input_units), input_units, unit, kernel, source, spec)
@@ -0,0 +1,222 @@
+"""
+多进程批量换算和公式求值
+
+数值通过共享内存交给工作进程，单位只以换算因子表或公式描述(表达式和单位名)的形式传递，
+不序列化 Unit 对象；工作进程各自重新编译公式并缓存。数据量小、只有一个工作进程
+或平台不支持共享内存时在本进程内串行执行，结果相同。
+"""
+import os
+from array import array
+
+from .cache import LRUCache
+from .formula import compile_formula
+from .unit import Unit
+
+# 本进程已编译的公式内核: {公式描述: 内核}，工作进程中同一公式只编译一次
+_KERNELS = LRUCache(maxsize=64)
+
+
+def _kernel(spec):
+    kernel = _KERNELS.get(spec)
+    if kernel is None:
+        formula, returns, units = spec
+        kernel = compile_formula(formula, returns, **dict(units)).kernel
+        _KERNELS.put(spec, kernel)
+    return kernel
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _doubles(values):
+    """转成 float64 的一维连续缓冲区视图，已经是的(如 array('d')、float64 ndarray)不复制"""
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return memoryview(array('d', values))
+    if view.format == 'd' and view.ndim == 1 and view.c_contiguous:
+        return view
+    view.release()
+    return memoryview(array('d', values))
+
+
+def _compute(kind, prepared, columns, ids, out, start, stop):
+    """
+    计算 [start, stop) 区间并写入 out
+    kind 为 "convert" 时 prepared 为换算因子表(ids 为每个元素的因子下标，None 表示只有一个因子)，
+    为 "formula" 时 prepared 为公式内核
+    """
+    np = _numpy()
+    if np is not None:
+        cols = [np.frombuffer(c, dtype=float)[start:stop] for c in columns]
+        target = np.frombuffer(out, dtype=float)[start:stop]
+        if kind == "convert":
+            if ids is None:
+                target[:] = cols[0] * prepared[0]
+            else:
+                target[:] = cols[0] * np.asarray(prepared)[np.frombuffer(ids, dtype=np.intc)[start:stop]]
+        else:
+            target[:] = prepared(*cols)
+        return
+
+    cols = [c[start:stop] for c in columns]
+    if kind == "convert":
+        if ids is None:
+            factor = prepared[0]
+            result = array('d', [v * factor for v in cols[0]])
+        else:
+            result = array('d', [v * prepared[i] for v, i in zip(cols[0], ids[start:stop])])
+    elif cols:
+        result = array('d', map(prepared, *cols))
+    else:
+        result = array('d', [prepared()]) * (stop - start)
+    out[start:stop] = result
+
+
+def _run_shared(kind, job, names, ids_name, out_name, n, start, stop):
+    """工作进程入口: 挂载共享内存，计算一个区间"""
+    from multiprocessing.shared_memory import SharedMemory
+    blocks = [SharedMemory(name) for name in (*names, out_name)]
+    id_block = SharedMemory(ids_name) if ids_name else None
+    views = [b.buf[:8 * n].cast('d') for b in blocks]
+    ids = id_block.buf[:4 * n].cast('i') if id_block else None
+    try:
+        prepared = job if kind == "convert" else _kernel(job)
+        _compute(kind, prepared, views[:-1], ids, views[-1], start, stop)
+    finally:
+        for view in views:
+            view.release()
+        if ids is not None:
+            ids.release()
+            id_block.close()
+        for block in blocks:
+            block.close()
+
+
+class BatchExecutor:
+    """
+    进程池批量执行器，可重复使用，用完调用 close() 或使用 with 语句
+        with BatchExecutor(workers=4) as ex:
+            ex.convert(values, units, "m")          # array('d')，单位为 m
+            ex.evaluate(P, volts, ohms)             # array('d')，单位为 P.unit
+    workers 默认为 CPU 核数；每个任务最多 chunk_size 个元素，不超过 chunk_size 的数据串行计算
+    """
+    def __init__(self, workers=None, chunk_size=65536, context=None):
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._context = context
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            import multiprocessing
+            self._pool = multiprocessing.get_context(self._context).Pool(self.workers)
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def convert(self, values, units, target):
+        """
+        把 values 换算到目标单位，返回 array('d')
+        units 为单个单位，或与 values 等长的单位序列(每种单位只解析一次，按下标传给工作进程)
+        """
+        if not isinstance(target, Unit):
+            target = Unit(target)
+        if isinstance(units, (str, Unit)):
+            return self._run("convert", (Unit.converter(units, target).factor,), [values], None)
+        table = {}
+        ids = array('i', [table.setdefault(u, len(table)) for u in units])
+        factors = tuple(Unit.converter(u, target).factor for u in table)
+        return self._run("convert", factors, [values], ids)
+
+    def evaluate(self, formula, *columns, **named):
+        """
+        对 compile_formula 编译的公式逐元素求值，返回 array('d')，单位为 formula.unit
+        各列为声明单位下的数值序列，按 formula.names 的顺序或按名字给出
+        由函数编译的公式不能传给工作进程，只能串行计算
+        """
+        columns = list(columns) + [named.pop(name) for name in formula.names[len(columns):] if name in named]
+        if named or len(columns) != len(formula.names):
+            raise TypeError(f"Formula takes arguments ({', '.join(formula.names)})")
+        return self._run("formula", formula, columns, None)
+
+    def _run(self, kind, job, columns, ids):
+        columns = [_doubles(c) for c in columns]
+        n = len(columns[0]) if columns else 0
+        if any(len(c) != n for c in columns) or (ids is not None and len(ids) != n):
+            raise ValueError("All columns must have the same length")
+
+        parallel = self.workers > 1 and n > self.chunk_size
+        if parallel and kind == "formula" and job.spec is None:
+            parallel = False
+        if parallel:
+            try:
+                from multiprocessing.shared_memory import SharedMemory
+            except ImportError:   # 平台不支持共享内存
+                parallel = False
+        if not parallel:
+            out = array('d', bytes(8 * n))
+            prepared = job.kernel if kind == "formula" else job
+            _compute(kind, prepared, columns, None if ids is None else memoryview(ids), memoryview(out), 0, n)
+            return out
+
+        blocks = []
+        try:
+            for column in columns:
+                block = SharedMemory(create=True, size=8 * n)
+                block.buf[:8 * n] = column.cast('B')
+                blocks.append(block)
+            id_name = None
+            if ids is not None:
+                id_block = SharedMemory(create=True, size=4 * n)
+                id_block.buf[:4 * n] = memoryview(ids).cast('B')
+                blocks.append(id_block)
+                id_name = id_block.name
+            out_block = SharedMemory(create=True, size=8 * n)
+            blocks.append(out_block)
+
+            # 块大小不超过 chunk_size，且至少分给每个工作进程一块
+            step = min(self.chunk_size, -(-n // self.workers))
+            names = [b.name for b in blocks[:len(columns)]]
+            # 公式以可重建的描述传给工作进程
+            task_job = job.spec if kind == "formula" else job
+            tasks = [(kind, task_job, names, id_name, out_block.name, n, start, min(start + step, n))
+                     for start in range(0, n, step)]
+            self._get_pool().starmap(_run_shared, tasks)
+
+            out = array('d')
+            out.frombytes(out_block.buf[:8 * n])
+            return out
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+
+def convert_batch(values, units, target, workers=None, chunk_size=65536):
+    """用临时的 BatchExecutor 执行一次 convert，参数见 BatchExecutor.convert"""
+    with BatchExecutor(workers, chunk_size) as executor:
+        return executor.convert(values, units, target)
+
+
+def evaluate_batch(formula, *columns, workers=None, chunk_size=65536):
+    """用临时的 BatchExecutor 执行一次 evaluate，参数见 BatchExecutor.evaluate"""
+    with BatchExecutor(workers, chunk_size) as executor:
+        return executor.evaluate(formula, *columns)
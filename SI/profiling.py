@@ -0,0 +1,216 @@
+"""
+热点函数的可选性能统计，默认关闭，关闭时没有任何额外开销
+
+    from SI import profiling
+    profiling.enable()
+    ...
+    profiling.snapshot()           # dict: 各函数调用次数和耗时、缓存命中率、最常解析的单位字符串
+    profiling.dump("prof.json")
+
+    with profiling.profile() as p:  # 只统计 with 块内的调用
+        ...
+
+也可以设置环境变量 SI_PROFILE=1 在 import SI 时开启，
+同时设置 SI_PROFILE_OUTPUT=路径 则在进程退出时把统计写入该 JSON 文件。
+
+开启时用计时包装函数替换下列函数，关闭时恢复原函数。耗时包含内部调用(如 Unit() 包含解析)，
+多线程并发时计数为近似值。
+"""
+from collections import Counter
+from time import perf_counter_ns
+
+from . import unit as _unit_module
+from .quantity import Quantity
+from .unit import Unit, _UnitMeta
+from .unitsystem import UnitSystem
+
+# 统计的热点函数: (统计名, 类, 属性名)
+HOT_FUNCTIONS = (
+    ("Unit()", _UnitMeta, "__call__"),
+    ("Unit.parse_expr", Unit, "parse_expr"),
+    ("Unit._basical_unit", Unit, "_basical_unit"),
+    ("UnitSystem.lookup", UnitSystem, "lookup"),
+    ("Unit.to_derived_unit", Unit, "to_derived_unit"),
+    ("Unit._derive", Unit, "_derive"),
+    ("Unit.is_compatible", Unit, "is_compatible"),
+    ("Unit.convert_to", Unit, "convert_to"),
+    ("Unit.converter", Unit, "converter"),
+    ("Quantity.__init__", Quantity, "__init__"),
+)
+
+# 统计命中率的缓存
+CACHES = {
+    "parse": _unit_module._PARSE_CACHE,
+    "algebra": _unit_module._ALGEBRA_CACHE,
+    "converter": _unit_module._CONVERTER_CACHE,
+}
+
+# {统计名: [调用次数, 累计耗时 ns]}
+_CALLS = {name: [0, 0] for name, _, _ in HOT_FUNCTIONS}
+# 以字符串构造 Unit 的次数: {表达式: 次数}
+_PARSED = Counter()
+# 开启时被替换的原函数: {(类, 属性名): 原属性}
+_ORIGINALS = {}
+# reset() 时的统计状态，snapshot() 报告此后的增量
+_base = None
+
+
+def _timed(name, func):
+    stat = _CALLS[name]
+
+    def wrapper(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stat[0] += 1
+            stat[1] += perf_counter_ns() - start
+    wrapper.__name__ = func.__name__
+    wrapper.__qualname__ = func.__qualname__
+    wrapper.__doc__ = func.__doc__
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def _unit_call(func):
+    """Unit() 的包装: 另外记录被解析的表达式"""
+    timed = _timed("Unit()", func)
+
+    def wrapper(cls, name, *args, **kwargs):
+        if isinstance(name, str):
+            _PARSED[name] += 1
+        return timed(cls, name, *args, **kwargs)
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def _instrumented(name, attr):
+    """按原属性的类型(普通函数、classmethod、staticmethod)生成包装"""
+    if isinstance(attr, classmethod):
+        return classmethod(_timed(name, attr.__func__))
+    if isinstance(attr, staticmethod):
+        return staticmethod(_timed(name, attr.__func__))
+    if name == "Unit()":
+        return _unit_call(attr)
+    return _timed(name, attr)
+
+
+def is_enabled():
+    return bool(_ORIGINALS)
+
+
+def enable():
+    """开启统计(已开启时不做任何事)，第一次开启时同时重置统计"""
+    if _ORIGINALS:
+        return
+    if _base is None:
+        reset()
+    for name, cls, attr_name in HOT_FUNCTIONS:
+        attr = cls.__dict__[attr_name]
+        _ORIGINALS[(cls, attr_name)] = attr
+        setattr(cls, attr_name, _instrumented(name, attr))
+
+
+def disable():
+    """关闭统计并恢复原函数，已有的统计保留"""
+    while _ORIGINALS:
+        (cls, attr_name), attr = _ORIGINALS.popitem()
+        setattr(cls, attr_name, attr)
+
+
+def _state():
+    return ({name: tuple(stat) for name, stat in _CALLS.items()},
+            Counter(_PARSED),
+            {name: (cache.hits, cache.misses) for name, cache in CACHES.items()})
+
+
+def reset():
+    """从现在开始重新统计"""
+    global _base
+    _base = _state()
+
+
+def _report(start, end, top):
+    calls = {}
+    for name, (count, ns) in end[0].items():
+        count -= start[0][name][0]
+        ns -= start[0][name][1]
+        if count:
+            calls[name] = {"calls": count, "total_ms": ns / 1e6, "mean_us": ns / count / 1e3}
+    caches = {}
+    for name, (hits, misses) in end[2].items():
+        hits -= start[2][name][0]
+        misses -= start[2][name][1]
+        total = hits + misses
+        caches[name] = {"hits": hits, "misses": misses, "hit_rate": hits / total if total else None}
+    return {
+        "enabled": is_enabled(),
+        # 按累计耗时从高到低
+        "functions": dict(sorted(calls.items(), key=lambda item: -item[1]["total_ms"])),
+        "caches": caches,
+        "top_units": (end[1] - start[1]).most_common(top),
+    }
+
+
+def snapshot(top=10):
+    """
+    返回自上次 reset() 以来的统计:
+        {"enabled": bool,
+         "functions": {统计名: {"calls", "total_ms", "mean_us"}},
+         "caches": {缓存名: {"hits", "misses", "hit_rate"}},
+         "top_units": [(表达式, 次数), ...]}
+    """
+    return _report(_base or _state(), _state(), top)
+
+
+def dump(target=None, top=10):
+    """把 snapshot() 写成 JSON，target 为文件路径或文本文件，为 None 时返回字符串"""
+    import json
+    text = json.dumps(snapshot(top), indent=2, ensure_ascii=False)
+    if target is None:
+        return text
+    if isinstance(target, str):
+        with open(target, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        target.write(text)
+
+
+def profile(top=10):
+    """
+    只统计 with 块内的调用，结束后结果在 stats 中(格式同 snapshot())
+        with profiling.profile() as p:
+            ...
+        p.stats
+    块外原本关闭的统计在结束时重新关闭，不影响全局统计
+    """
+    return _Profile(top)
+
+
+class _Profile:
+    def __init__(self, top):
+        self.top = top
+        self.stats = None
+
+    def __enter__(self):
+        self._was_enabled = is_enabled()
+        enable()
+        self._start = _state()
+        return self
+
+    def __exit__(self, *exc):
+        end = _state()
+        if not self._was_enabled:
+            disable()
+        self.stats = _report(self._start, end, self.top)
+
+
+def _enable_from_env(environ):
+    """SI_PROFILE 非空且不为 0 时开启，SI_PROFILE_OUTPUT 指定退出时写入的文件"""
+    if environ.get("SI_PROFILE", "0") in ("", "0"):
+        return
+    enable()
+    output = environ.get("SI_PROFILE_OUTPUT")
+    if output:
+        import atexit
+        atexit.register(dump, output)
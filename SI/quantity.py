@@ -1,14 +1,165 @@
+from .cache import LRUCache
+from .engineering import engineering
 from .unit import Unit
+from .unitsystem import UnitSystem
 from collections import defaultdict
 
+# toMeV/tonm/toeV 用到的参考单位，首次使用时解析
+_REFERENCE_UNITS = {}
+# toMeV/tonm/toeV 的换算规则: {(目标单位名, 来源单位): (是否取倒数, 因子)}
+_SPECTRAL_CACHE = LRUCache(maxsize=256)
+# Quantity.parse 用的扫描器(数值 + 单位表达式)，首次使用时编译
+_SCANNER = None
+# format_many 每次写入的行数
+_FORMAT_CHUNK = 4096
+
+
+def _scanner():
+    global _SCANNER
+    if _SCANNER is None:
+        import re
+        _SCANNER = re.compile(r"\s*([-+]?(?:(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|inf|nan))\s*(.*?)\s*$",
+                              re.IGNORECASE)
+    return _SCANNER
+
+
+def _reference_unit(expr):
+    unit = _REFERENCE_UNITS.get(expr)
+    if unit is None:
+        unit = _REFERENCE_UNITS[expr] = Unit(expr)
+    return unit
+
+
+def _spectral_factor(target, unit):
+    """
+    来源单位下的数值换算到 target ('MeV'、'nm' 或 'eV') 的规则 (是否取倒数, 因子):
+    结果为 数值 * 因子，或取倒数时为 因子 / 数值
+    h*c、c**2 在目标单位下的值并入因子，每种来源单位只计算一次
+    """
+    version = UnitSystem._version
+    _SPECTRAL_CACHE.validate(version)
+    key = (target, unit)
+    rule = _SPECTRAL_CACHE.get(key)
+    if rule is None:
+        rule = _spectral_rule(target, unit)
+        _SPECTRAL_CACHE.put(key, rule, version)
+    return rule
+
+
+def _spectral_rule(target, unit):
+    from .constants import Constants   # 避免循环导入
+    out = _reference_unit(target)
+    c = Constants.c.value * Constants.c.unit.factor
+    if target == "MeV":
+        # 质量 E = mc²，动量 E = pc
+        for expr, scale in (("MeV", 1), ("kg", c * c), ("kg*m/s", c)):
+            if unit.dim == _reference_unit(expr).dim:
+                return False, unit.factor * scale / out.factor
+    elif unit.dim == out.dim:
+        return False, unit.factor / out.factor
+    elif unit.dim == _reference_unit("m" if target == "eV" else "eV").dim:
+        # 波长与光子能量互为倒数: E = hc/λ
+        hc = Constants.h.value * Constants.h.unit.factor * c
+        return True, hc / (unit.factor * out.factor)
+    raise ValueError(f"Unit can't convert to {target}: {unit} ")
+
+
 class Quantity:
-    """物理量类，包含数值和单位"""
+    """物理量类，包含数值和单位，不可变"""
+    __slots__ = ('value', 'unit')
+
     def __init__(self, value, unit):
         if not isinstance(unit, Unit):
             unit = Unit(unit)
-        self.value = value
-        self.unit = unit
-    
+        setattr_ = object.__setattr__
+        setattr_(self, 'value', value)
+        setattr_(self, 'unit', unit)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __reduce__(self):
+        return (type(self), (self.value, self.unit))
+
+    def __eq__(self, other):
+        """量纲相同且换算到基本单位后数值相等，如 1 m == 1000 mm"""
+        if not isinstance(other, Quantity):
+            return NotImplemented
+        return (self.unit.dim == other.unit.dim
+                and self.value * self.unit.factor == other.value * other.unit.factor)
+
+    def __hash__(self):
+        return hash((self.unit.dim, self.value * self.unit.factor))
+
+    @classmethod
+    def parse(cls, text):
+        """
+        解析 "3.2 km/h"、"50 kOhm"、"1e-9 s" 这样的文本，只有数值时为无量纲
+        单位经 Unit() 的解析缓存，相同的单位字符串不重复解析
+        """
+        m = _scanner().match(text)
+        if m is None:
+            raise ValueError(f"Invalid quantity: {text!r}")
+        return cls(float(m.group(1)), m.group(2) or '1')
+
+    @classmethod
+    def parse_many(cls, source):
+        """
+        逐行解析并逐个生成 Quantity，跳过空行
+        source 为字符串的可迭代对象、已打开的文本文件或文件路径；
+        同一批中相同的单位字符串只取一次 Unit
+        """
+        if isinstance(source, str):
+            with open(source, encoding="utf-8") as f:
+                yield from cls.parse_many(f)
+            return
+        match = _scanner().match
+        units = {}
+        for lineno, text in enumerate(source, 1):
+            m = match(text)
+            if m is None:
+                if text.strip():
+                    raise ValueError(f"Invalid quantity on line {lineno}: {text!r}")
+                continue
+            value, name = m.groups()
+            unit = units.get(name)
+            if unit is None:
+                unit = units[name] = Unit(name or '1')
+            yield cls(float(value), unit)
+
+    @staticmethod
+    def format_many(quantities, stream, precision=6):
+        """
+        把一组物理量逐行写入文本流，格式同 str(Quantity)，数值保留 precision 位小数
+        每种单位的名称只生成一次，QuantityArray 按元素逐行写出；返回写入的行数
+        """
+        # {id(单位): (单位, 数值后的单位文本)}，保留单位的引用以免 id 被复用
+        suffixes = {}
+        lines = []
+        count = 0
+        for q in quantities:
+            entry = suffixes.get(id(q.unit))
+            if entry is None:
+                name = q.unit.name
+                entry = suffixes[id(q.unit)] = (q.unit, '' if name == '1' else ' ' + name)
+            suffix = entry[1]
+            value = q.value
+            if getattr(value, 'ndim', 0):
+                lines.extend([f"{round(v, precision)}{suffix}" for v in value.ravel().tolist()])
+            else:
+                lines.append(f"{round(value, precision)}{suffix}")
+            if len(lines) >= _FORMAT_CHUNK:
+                stream.write("\n".join(lines) + "\n")
+                count += len(lines)
+                lines.clear()
+        if lines:
+            stream.write("\n".join(lines) + "\n")
+            count += len(lines)
+        return count
+
     def to_derived_unit(self):
         """转换为匹配的导出单位表示"""
         # 先转换单位部分
@@ -20,46 +171,37 @@ class Quantity:
         """转换到目标单位"""
         if not isinstance(target_unit, Unit):
             target_unit = Unit(target_unit)
-        
-        if not self.unit.is_compatible(target_unit):
-            raise ValueError(f"Incompatible units: {self.unit} and {target_unit}")
-        
-        conversion_factor = self.unit.convert_to(target_unit)
+        # 量纲检查和换算因子由共享的换算器缓存提供
+        conversion_factor = Unit.converter(self.unit, target_unit).factor
         return Quantity(self.value * conversion_factor, target_unit)
     
+    def to_engineering(self):
+        """换算到自动选择词头的单位，如 0.00005 A -> 50 uA，15000 Ohm -> 15 kOhm"""
+        value, unit = engineering(self.value, self.unit)
+        return Quantity(value, unit)
+
+    def _spectral(self, target):
+        invert, factor = _spectral_factor(target, self.unit)
+        value = factor / self.value if invert else self.value * factor
+        return type(self)(value, _reference_unit(target))
+
     def toMeV(self):
-        from .constants import Constants
-        if self.unit.is_compatible(Unit("kg")):
-            return (self*Constants.c**2).to("MeV")
-        if self.unit.is_compatible(Unit("kg*m/s")):
-            return (self*Constants.c).to("MeV")
-        if self.unit.is_compatible(Unit("MeV")):
-            return self.to("MeV")
-        raise ValueError(f"Unit can't convert to MeV: {self.unit} ")
-    
+        """能量、质量(E = mc²)或动量(E = pc)换算为 MeV，QuantityArray 整体一次换算"""
+        return self._spectral("MeV")
+
     def tonm(self):
-        from .constants import Constants
-        if self.unit.is_compatible(Unit("m")):
-            return self.to("nm")
-        elif self.unit.is_compatible(Unit("eV")):
-            return (Constants.h*Constants.c/self).to("nm")
-        raise ValueError(f"Unit can't convert to nm: {self.unit} ")
-    
+        """长度或光子能量(λ = hc/E)换算为 nm"""
+        return self._spectral("nm")
+
     def toeV(self):
-        from .constants import Constants
-        if self.unit.is_compatible(Unit("m")):
-            return (Constants.h*Constants.c/self).to("eV")
-        elif self.unit.is_compatible(Unit("eV")):
-            return self.to("nm")
-        raise ValueError(f"Unit can't convert to nm: {self.unit} ")
+        """光子能量或波长(E = hc/λ)换算为 eV"""
+        return self._spectral("eV")
     
     def __mul__(self, other):
         if isinstance(other, Quantity):
-            unit_mul=self.unit * other.unit
-            return Quantity(self.value * other.value ,unit_mul).to_derived_unit()
+            return _derived(self.value * other.value, self.unit * other.unit)
         elif isinstance(other, Unit):
-            unit_mul=self.unit * other
-            return Quantity(self.value , unit_mul).to_derived_unit()
+            return _derived(self.value, self.unit * other)
         else:
             return Quantity(self.value * other, self.unit)
     
@@ -68,8 +210,7 @@ class Quantity:
     
     def __truediv__(self, other):
         if isinstance(other, Quantity):
-            unit_sub=self.unit / other.unit
-            return Quantity(self.value / other.value, unit_sub).to_derived_unit()
+            return _derived(self.value / other.value, self.unit / other.unit)
         elif isinstance(other, Unit):
             return self*(1/other)
         else:
@@ -97,4 +238,14 @@ class Quantity:
         return f"{round(self.value,6)} {self.unit.name}"
     
     def __repr__(self):
-        return f"Quantity({self.value}, {repr(self.unit)})"
\ No newline at end of file
+        return f"Quantity({self.value}, {repr(self.unit)})"
+
+
+def _derived(value, unit):
+    """
+    unit 下的数值化简为导出单位，与 Quantity(value, unit).to_derived_unit() 逐位相同，
+    但不创建中间的 Quantity；化简因子缓存在驻留的单位上
+    """
+    factor, unit = unit.to_derived_unit()
+    return Quantity(value * factor, unit)
+
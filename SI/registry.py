@@ -0,0 +1,246 @@
+"""
+预编译单位注册表快照
+
+把所有(带词头的)单位符号和常用复合表达式预先解析好，写成定长记录的二进制文件，
+按内存映射加载后经散列槽表直接命中，不需要构建符号索引或解析表达式；
+快照中没有的符号和表达式回退到正常的查找和解析。
+
+    python -m SI.registry             # 由当前单位表生成 SI/_registry.bin
+    python -m SI.registry out.bin     # 生成到指定文件
+
+默认快照在第一次查找单位时加载；文件不存在或已过期时(如新的检出或安装)先用内置单位表生成，
+约 10 ms，只发生一次，包目录不可写时跳过。单位表与生成快照时不一致(指纹不同)时忽略快照，
+运行时用 UnitSystem.register_unit 等修改单位表后快照自动停用。
+
+文件格式(小端):
+    文件头  magic(8s) 格式版本(I) 单位表指纹(I) 记录数(I) 记录长度(I) 槽数(I)
+    槽表    槽数 x 记录下标(I)，开放寻址，槽位为 crc32(表达式) % 槽数，空槽为 EMPTY
+    记录    表达式(24s) 换算因子(d) 量纲向量(7b) 标志(B) 项数(B) 6 x [符号(8s) 指数(b)]
+标志 NAMED 表示单位名就是表达式本身(单个符号)，INT_FACTOR 表示换算因子原本是整数(如 min 的 60)。
+"""
+import mmap
+import os
+import struct
+import zlib
+from _thread import get_ident
+
+from .unit import Unit
+from .unitsystem import UnitSystem
+
+MAGIC = b"SIUNITS\0"
+FORMAT_VERSION = 2
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_registry.bin")
+
+HEADER = struct.Struct("<8sIIIII")
+MAX_TERMS = 6
+RECORD = struct.Struct("<24sd7bBB" + "8sb" * MAX_TERMS)
+# 记录的前半部分(不含各项)，单个符号只需要这一部分
+RECORD_HEAD = struct.Struct("<24sd7bBB")
+KEY_SIZE = 24
+SYMBOL_SIZE = 8
+NAMED = 1
+INT_FACTOR = 2
+EMPTY = 0xFFFFFFFF
+
+# 随快照预解析的常用复合表达式
+COMMON_EXPRESSIONS = (
+    "m/s", "km/h", "km/s", "mile/h", "m/s^2", "m^2", "m^3", "cm^2", "cm^3", "mm^2", "1/s", "1/m",
+    "kg/m^3", "g/cm^3", "kg*m/s", "kg*m/s^2", "kg*m^2/s^2", "kg*m^2/s^3", "kg*m^2/(A^2*s^3)",
+    "N*m", "N/m", "N/m^2", "Pa*s", "kg/(m*s)", "m^3/s", "J/kg", "J/K", "J/(kg*K)", "J/(mol*K)",
+    "J/(mol·K)", "W/m^2", "W/(m*K)", "W/(m^2*K)", "V/m", "A/m", "A/m^2", "C/kg", "C/m^3", "mol/m^3",
+    "kWh/year", "eV/K",
+)
+
+
+def fingerprint():
+    """当前单位表的指纹，单位表任何变化都会改变它"""
+    tables = (sorted(UnitSystem.BASE_UNITS), UnitSystem.PREFIXES,
+              UnitSystem.DERIVED_UNITS, UnitSystem.English_UNITS)
+    return zlib.crc32(repr(tables).encode("utf-8"))
+
+
+def _record(key, unit):
+    """Unit -> 定长记录，表达式或符号超长、项数过多时返回 None"""
+    encoded = key.encode("utf-8")
+    terms = [(s.encode("utf-8"), e) for s, e in unit._unitdict_raw.items()]
+    if (len(encoded) > KEY_SIZE or len(terms) > MAX_TERMS
+            or any(len(s) > SYMBOL_SIZE or not -128 <= e < 128 for s, e in terms)):
+        return None
+    flags = (NAMED if unit._name == key else 0) | (INT_FACTOR if isinstance(unit.factor, int) else 0)
+    fields = [encoded, unit.factor, *unit.dim, flags, len(terms)]
+    for symbol, exp in terms + [(b"", 0)] * (MAX_TERMS - len(terms)):
+        fields += [symbol, exp]
+    return RECORD.pack(*fields)
+
+
+def build(path=DEFAULT_PATH, expressions=COMMON_EXPRESSIONS):
+    """由当前单位表生成快照文件，返回记录数"""
+    records = {}
+    for symbol in UnitSystem.rebuild_index():
+        records[symbol] = Unit._basical_unit(symbol)
+    for expr in expressions:
+        try:
+            records["".join(expr.split())] = Unit.parse_expr(expr)
+        except ValueError:   # 当前单位表中未定义的符号
+            continue
+    packed = [r for r in (_record(k, u) for k, u in records.items()) if r is not None]
+    packed.sort(key=lambda r: r[:KEY_SIZE])
+    # 槽数取不小于记录数两倍的 2 的幂，探测链很短
+    nslots = 1 << (2 * len(packed)).bit_length()
+    slots = [EMPTY] * nslots
+    for i, record in enumerate(packed):
+        h = zlib.crc32(record[:KEY_SIZE]) & (nslots - 1)
+        while slots[h] != EMPTY:
+            h = (h + 1) & (nslots - 1)
+        slots[h] = i
+    # 先写临时文件再替换，已映射旧文件的进程不受影响
+    tmp = f"{path}.{os.getpid()}.{get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, fingerprint(), len(packed), RECORD.size, nslots))
+        f.write(struct.pack(f"<{nslots}I", *slots))
+        f.writelines(packed)
+    os.replace(tmp, path)
+    return len(packed)
+
+
+def _factor(record):
+    # 保持与解析结果相同的数值类型
+    return int(record[1]) if record[9] & INT_FACTOR else record[1]
+
+
+class RegistrySnapshot:
+    """内存映射的快照文件，只在单位表版本与加载时相同时有效"""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._slots = None
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"Not a unit registry snapshot: {path}")
+        magic, fmt, self.fingerprint, self.count, size, nslots = HEADER.unpack_from(self._map)
+        if (magic != MAGIC or fmt != FORMAT_VERSION or size != RECORD.size
+                or nslots & (nslots - 1) or nslots <= self.count):
+            self.close()
+            raise ValueError(f"Not a unit registry snapshot: {path}")
+        self._records = HEADER.size + 4 * nslots
+        if self._records + self.count * size > len(self._map):
+            self.close()
+            raise ValueError(f"Truncated unit registry snapshot: {path}")
+        self._slots = memoryview(self._map)[HEADER.size:self._records].cast('I')
+        self._mask = nslots - 1
+        self.path = path
+        self.version = UnitSystem._version
+
+    def close(self):
+        if self._slots is not None:
+            self._slots.release()
+        self._map.close()
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def active(self):
+        return self.version == UnitSystem._version
+
+    def _find(self, key, layout=RECORD):
+        """按散列槽查找，返回按 layout 解包的记录或 None"""
+        try:
+            target = key.encode("utf-8").ljust(KEY_SIZE, b"\0")
+        except UnicodeEncodeError:
+            return None
+        if len(target) > KEY_SIZE:
+            return None
+        data, slots, mask = self._map, self._slots, self._mask
+        h = zlib.crc32(target) & mask
+        while True:
+            i = slots[h]
+            if i == EMPTY:
+                return None
+            start = self._records + i * RECORD.size
+            if data[start:start + KEY_SIZE] == target:
+                return layout.unpack_from(data, start)
+            h = (h + 1) & mask
+
+    def lookup(self, symbol):
+        """单个符号 -> (换算因子, 量纲向量)，快照中没有时返回 None"""
+        record = self._find(symbol, RECORD_HEAD)
+        if record is None or not record[9] & NAMED:
+            return None
+        return _factor(record), UnitSystem.intern_dimension(record[2:9])
+
+    def unit(self, expr):
+        """规范化的表达式(不含空白) -> Unit，快照中没有时返回 None"""
+        record = self._find(expr, RECORD_HEAD)
+        if record is None:
+            return None
+        dim = UnitSystem.intern_dimension(record[2:9])
+        factor = _factor(record)
+        if record[9] & NAMED:
+            return Unit._make(expr, factor, dim, {expr: 1})
+        terms = self._find(expr)[11:11 + 2 * record[10]]
+        unitdict = {terms[i].rstrip(b"\0").decode("utf-8"): terms[i + 1] for i in range(0, len(terms), 2)}
+        return Unit._make(None, factor, dim, unitdict)
+
+
+def load(path=DEFAULT_PATH):
+    """
+    加载快照，文件不存在或与当前单位表不一致时返回 None
+    加载成功后 UnitSystem 的查找和 Unit() 的解析都会先查快照
+    """
+    try:
+        snapshot = RegistrySnapshot(path)
+    except (OSError, ValueError):
+        return None
+    if snapshot.fingerprint != fingerprint():
+        import warnings
+        warnings.warn(f"Ignoring stale unit registry snapshot {path}; rebuild it with 'python -m SI.registry'")
+        snapshot.close()
+        return None
+    UnitSystem._snapshot = snapshot
+    return snapshot
+
+
+def _usable(path):
+    """快照文件存在、格式正确且与当前单位表一致"""
+    try:
+        snapshot = RegistrySnapshot(path)
+    except (OSError, ValueError):
+        return False
+    usable = snapshot.fingerprint == fingerprint()
+    snapshot.close()
+    return usable
+
+
+def load_default():
+    """
+    加载默认快照: 单位表未修改过时，文件不存在、格式过旧或由旧的单位表生成的都先重新生成
+    (单位表已修改时生成的快照对其他进程是过期的，所以不生成)
+    """
+    if UnitSystem._version == 0 and not _usable(DEFAULT_PATH):
+        try:
+            build(DEFAULT_PATH)
+        except OSError:   # 包目录不可写
+            return None
+    return load(DEFAULT_PATH)
+
+
+def unload():
+    """停用快照，之后只用符号索引和解析器"""
+    snapshot = UnitSystem._snapshot
+    UnitSystem._snapshot = False
+    UnitSystem.invalidate()
+    if snapshot:
+        snapshot.close()
+
+
+def main(argv=None):
+    import sys
+    args = sys.argv[1:] if argv is None else argv
+    path = args[0] if args else DEFAULT_PATH
+    count = build(path)
+    print(f"wrote {count} records ({os.path.getsize(path)} bytes) to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+本地单位换算服务: asyncio 服务端和客户端，经 Unix 套接字通信
+
+    python -m SI.server /tmp/si-units.sock          # 启动服务
+
+    async with ConversionClient("/tmp/si-units.sock") as client:
+        await client.convert(36, "km/h", "m/s")     # 10.0
+        await client.convert([1, 2], "inch", "mm")  # [25.4, 50.8]
+        await client.to_derived(2, "N*m")           # (2.0, 'J')
+
+服务端把一个批处理窗口(window 秒，或攒够 max_batch 个请求)内所有连接的请求合并处理:
+相同的 (操作, 来源单位, 目标单位) 只解析和计算一次换算因子，每个连接的全部应答一次写回。
+
+协议为每行一个 JSON 数组:
+    请求  [编号, "to", 数值或数值列表, 来源单位, 目标单位]
+          [编号, "derived", 数值或数值列表, 单位]
+    应答  [编号, 结果] 或 [编号, 结果, 导出单位名]，出错时为 [编号, null, 错误信息]
+"""
+import asyncio
+import json
+import os
+
+from .unit import Unit
+
+DEFAULT_WINDOW = 0.001
+DEFAULT_MAX_BATCH = 1024
+
+
+def _apply(factor, value):
+    if isinstance(value, list):
+        return [v * factor for v in value]
+    return value * factor
+
+
+_ARITY = {"to": 2, "derived": 1}
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check(request):
+    """检查请求的格式，返回 (编号, (操作, 单位...), 数值)，格式错误时抛出 ValueError"""
+    if not isinstance(request, list) or len(request) < 3:
+        raise ValueError("Request must be [id, op, value, unit...]")
+    rid, op, value, *units = request
+    if not isinstance(rid, (int, str)) or isinstance(rid, bool):
+        raise ValueError(f"Request id must be an integer or a string, got {rid!r}")
+    if not isinstance(op, str) or op not in _ARITY:
+        raise ValueError(f"Unknown operation: {op!r}")
+    if len(units) != _ARITY[op]:
+        raise ValueError(f"Operation {op!r} takes {_ARITY[op]} unit(s), got {len(units)}")
+    if not all(isinstance(u, str) for u in units):
+        raise ValueError(f"Units must be strings, got {units!r}")
+    if not (_is_number(value) or isinstance(value, list) and all(map(_is_number, value))):
+        raise ValueError(f"Invalid value: {value!r}")
+    return rid, (op, *units), value
+
+
+def _resolve(key):
+    """(操作, 单位...) -> (换算因子, 导出单位名或 None)，单位或操作无效时抛出 ValueError"""
+    op = key[0]
+    if op == "to":
+        return Unit.converter(Unit(key[1]), Unit(key[2])).factor, None
+    if op == "derived":
+        factor, unit = Unit(key[1]).to_derived_unit()
+        return factor, unit.name
+    raise ValueError(f"Unknown operation: {op!r}")
+
+
+class ConversionServer:
+    """
+    换算服务，window 为批处理窗口(秒)，max_batch 为一批的最大请求数
+    stats 记录处理的批数、请求数和去重后计算的换算数
+    """
+    def __init__(self, path, window=DEFAULT_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        self.path = path
+        self.window = window
+        self.max_batch = max_batch
+        self.stats = {"batches": 0, "requests": 0, "resolved": 0}
+        self._pending = []
+        self._timer = None
+        self._server = None
+
+    async def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        return self
+
+    async def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._flush()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    writer.write(json.dumps([None, None, f"Malformed request: {line[:80]!r}"]).encode() + b"\n")
+                    continue
+                try:
+                    rid, key, value = _check(request)
+                except ValueError as e:
+                    # 格式错误的请求立即应答，不进入批处理
+                    rid = request[0] if isinstance(request, list) and request else None
+                    if not isinstance(rid, (int, str)):
+                        rid = None
+                    writer.write(json.dumps([rid, None, str(e)]).encode() + b"\n")
+                    continue
+                self._pending.append((writer, rid, key, value))
+                if len(self._pending) >= self.max_batch:
+                    self._flush()
+                elif self._timer is None:
+                    self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _flush(self):
+        """处理当前一批请求: 每个不同的 (操作, 单位...) 只计算一次，每个连接的应答一次写回"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        resolved = {}
+        replies = {}
+        for writer, rid, key, value in batch:
+            # 任何异常都只作为该请求的错误应答，不能中断整批
+            try:
+                result = resolved.get(key)
+                if result is None:
+                    try:
+                        result = _resolve(key)
+                    except Exception as e:
+                        result = e
+                    resolved[key] = result
+                if isinstance(result, Exception):
+                    raise result
+                factor, name = result
+                converted = _apply(factor, value)
+                reply = [rid, converted] if name is None else [rid, converted, name]
+                line = json.dumps(reply)
+            except Exception as e:
+                line = json.dumps([rid, None, str(e) or type(e).__name__])
+            replies.setdefault(writer, []).append(line)
+        for writer, lines in replies.items():
+            if not writer.is_closing():
+                writer.write(("\n".join(lines) + "\n").encode())
+        self.stats["batches"] += 1
+        self.stats["requests"] += len(batch)
+        self.stats["resolved"] += len(resolved)
+
+
+class ConversionClient:
+    """
+    换算服务的客户端，一个连接上可以并发发出多个请求(按编号匹配应答)
+    服务端返回的错误以 ValueError 抛出
+    """
+    def __init__(self, path):
+        self.path = path
+        self._reader = None
+        self._writer = None
+        self._futures = {}
+        self._next_id = 0
+        self._receiver = None
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+        self._receiver = asyncio.ensure_future(self._receive())
+        return self
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._writer = None
+        if self._receiver is not None:
+            await self._receiver
+            self._receiver = None
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _receive(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                rid, *result = json.loads(line)
+                future = self._futures.pop(rid, None)
+                if future is None or future.done():
+                    continue
+                if result[0] is None and len(result) > 1:
+                    future.set_exception(ValueError(result[1]))
+                else:
+                    future.set_result(result[0] if len(result) == 1 else tuple(result))
+        except ConnectionError:
+            pass
+        finally:
+            error = ConnectionError("Conversion server closed the connection")
+            for future in self._futures.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._futures.clear()
+
+    async def _request(self, op, value, *units):
+        if self._writer is None:
+            raise ConnectionError("Client is not connected")
+        rid = self._next_id
+        self._next_id += 1
+        future = self._futures[rid] = asyncio.get_running_loop().create_future()
+        self._writer.write(json.dumps([rid, op, value, *units]).encode() + b"\n")
+        return await future
+
+    async def convert(self, value, source, target):
+        """把 source 单位下的数值(或数值列表)换算到 target"""
+        return await self._request("to", value, source, target)
+
+    async def to_derived(self, value, unit):
+        """化简为导出单位，返回 (数值, 导出单位名)"""
+        return await self._request("derived", value, unit)
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Local unit conversion service")
+    parser.add_argument("path", help="Unix socket path")
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW, help="batch window in seconds")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    args = parser.parse_args(argv)
+
+    async def serve():
+        async with ConversionServer(args.path, args.window, args.max_batch) as server:
+            print(f"serving on {args.path}")
+            await server.serve_forever()
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
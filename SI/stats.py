@@ -0,0 +1,301 @@
+"""
+混合单位物理量的流式统计
+
+    from SI.stats import Mean, Variance
+    m = Mean()
+    m.update([Quantity(3, "mm"), Quantity(1, "inch"), (0.002, "km")])
+    m.result()            # Quantity，单位为第一个数据的单位(或构造时给出的 unit)
+    m.result("m")
+
+累加器内部只保存基本单位下的浮点状态，每种来源单位的换算因子只计算一次，
+读取结果时才创建 Quantity。数据可以是 Quantity、(数值, 单位) 或 QuantityArray(向量化处理)。
+"""
+import math
+from bisect import bisect_right
+from itertools import islice
+
+from .quantity import Quantity
+from .unit import Unit
+
+# 批量处理时每次取出的数据个数，内存占用与数据总量无关
+CHUNK_SIZE = 65536
+
+
+def _chunks(values):
+    values = iter(values)
+    while True:
+        chunk = list(islice(values, CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _Accumulator:
+    def __init__(self, unit=None):
+        if unit is not None and not isinstance(unit, Unit):
+            unit = Unit(unit)
+        # 读取结果时默认使用的单位，未给出时取第一个数据的单位
+        self.unit = unit
+        self.count = 0
+        # {单位: 到基本单位的因子}，字符串按值、Unit 按自身作键，
+        # 每行新建的单位字符串(如 split() 的结果)也只占一个条目
+        self._factors = {}
+
+    def _factor(self, unit):
+        """来源单位到基本单位的因子，第一次遇到该单位时检查量纲"""
+        factor = self._factors.get(unit)
+        if factor is not None:
+            return factor
+        parsed = unit if isinstance(unit, Unit) else Unit(unit)
+        if self.unit is None:
+            self.unit = parsed
+        elif parsed.dim != self.unit.dim:
+            raise ValueError(f"Unit {parsed} & {self.unit} can't be added")
+        self._factors[unit] = parsed.factor
+        return parsed.factor
+
+    def _base_values(self, quantities):
+        factors = self._factors
+        for q in quantities:
+            if isinstance(q, Quantity):
+                value, unit = q.value, q.unit
+            else:
+                value, unit = q
+            factor = factors.get(unit)
+            base = value * (factor if factor is not None else self._factor(unit))
+            if getattr(base, "ndim", 0):
+                # QuantityArray 整体向量化加入，不进入逐个标量的数据流
+                self._push_array(base.ravel())
+            else:
+                yield base
+
+    def add(self, quantity):
+        """加入一个数据: Quantity、(数值, 单位) 或 QuantityArray"""
+        if isinstance(quantity, Quantity):
+            value, unit = quantity.value, quantity.unit
+        else:
+            value, unit = quantity
+        base = value * self._factor(unit)
+        if getattr(base, "ndim", 0):
+            self._push_array(base.ravel())
+        else:
+            self._push(float(base))
+
+    def update(self, quantities):
+        """加入一批数据: Quantity、(数值, 单位) 或 QuantityArray"""
+        self._push_many(self._base_values(quantities))
+        return self
+
+    def _push_many(self, values):
+        push = self._push
+        for value in values:
+            push(value)
+
+    def _push_array(self, values):
+        self._push_many(values.tolist())
+
+    def _readout_unit(self, unit):
+        if unit is None:
+            if self.unit is None:
+                raise ValueError(f"{type(self).__name__} has no data and no unit")
+            return self.unit
+        unit = unit if isinstance(unit, Unit) else Unit(unit)
+        if self.unit is not None and unit.dim != self.unit.dim:
+            raise ValueError(f"Incompatible units: {self.unit} and {unit}")
+        return unit
+
+    def _quantity(self, base_value, unit):
+        unit = self._readout_unit(unit)
+        return Quantity(base_value / unit.factor, unit)
+
+    def _require_data(self):
+        if not self.count:
+            raise ValueError(f"{type(self).__name__} has no data")
+
+    def __repr__(self):
+        return f"{type(self).__name__}(count={self.count}, unit={self.unit})"
+
+
+class Sum(_Accumulator):
+    """求和，使用补偿求和减小大量数据累加的舍入误差"""
+    def __init__(self, unit=None):
+        super().__init__(unit)
+        self._total = 0.0
+        self._compensation = 0.0
+
+    def _push(self, value):
+        # Neumaier 补偿求和
+        total = self._total + value
+        if abs(self._total) >= abs(value):
+            self._compensation += (self._total - total) + value
+        else:
+            self._compensation += (value - total) + self._total
+        self._total = total
+        self.count += 1
+
+    def _push_many(self, values):
+        for chunk in _chunks(values):
+            self._push(math.fsum(chunk))
+            self.count += len(chunk) - 1
+
+    def _push_array(self, values):
+        self._push(math.fsum(values))
+        self.count += len(values) - 1
+
+    def result(self, unit=None):
+        return self._quantity(self._total + self._compensation, unit)
+
+
+class Mean(Sum):
+    """平均值"""
+    def result(self, unit=None):
+        self._require_data()
+        return self._quantity((self._total + self._compensation) / self.count, unit)
+
+
+class Variance(_Accumulator):
+    """方差与标准差(Welford 算法)，ddof=1 为样本方差"""
+    def __init__(self, unit=None, ddof=0):
+        super().__init__(unit)
+        self.ddof = ddof
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def _push(self, value):
+        self.count += 1
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+
+    def _push_array(self, values):
+        # 按 Chan 等人的公式合并整批数据的均值和二阶矩
+        n = len(values)
+        if not n:
+            return
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        total = self.count + n
+        delta = mean - self._mean
+        self._mean += delta * n / total
+        self._m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    def mean(self, unit=None):
+        self._require_data()
+        return self._quantity(self._mean, unit)
+
+    def result(self, unit=None):
+        """方差，单位为 unit 的平方"""
+        if self.count <= self.ddof:
+            raise ValueError(f"Variance needs more than {self.ddof} data points")
+        unit = self._readout_unit(unit)
+        return Quantity(self._m2 / (self.count - self.ddof) / unit.factor ** 2, unit ** 2)
+
+    def std(self, unit=None):
+        if self.count <= self.ddof:
+            raise ValueError(f"Variance needs more than {self.ddof} data points")
+        return self._quantity(math.sqrt(self._m2 / (self.count - self.ddof)), unit)
+
+
+class Min(_Accumulator):
+    """最小值"""
+    def __init__(self, unit=None):
+        super().__init__(unit)
+        self._value = math.inf
+
+    def _push(self, value):
+        self.count += 1
+        if value < self._value:
+            self._value = value
+
+    def _push_many(self, values):
+        for chunk in _chunks(values):
+            self._push(min(chunk))
+            self.count += len(chunk) - 1
+
+    def _push_array(self, values):
+        if len(values):
+            self._push(float(values.min()))
+            self.count += len(values) - 1
+
+    def result(self, unit=None):
+        self._require_data()
+        return self._quantity(self._value, unit)
+
+
+class Max(_Accumulator):
+    """最大值"""
+    def __init__(self, unit=None):
+        super().__init__(unit)
+        self._value = -math.inf
+
+    def _push(self, value):
+        self.count += 1
+        if value > self._value:
+            self._value = value
+
+    def _push_many(self, values):
+        for chunk in _chunks(values):
+            self._push(max(chunk))
+            self.count += len(chunk) - 1
+
+    def _push_array(self, values):
+        if len(values):
+            self._push(float(values.max()))
+            self.count += len(values) - 1
+
+    def result(self, unit=None):
+        self._require_data()
+        return self._quantity(self._value, unit)
+
+
+class Histogram(_Accumulator):
+    """
+    直方图，edges 为递增的分箱边界(unit 下的数值或 Quantity)，区间左闭右开
+    超出范围的数据计入 underflow / overflow
+        h = Histogram([0, 1, 2, 5], "m")
+        h.update(data)
+        h.result()        # 各分箱计数
+    """
+    def __init__(self, edges, unit=None):
+        edges = list(edges)
+        if unit is None and edges and isinstance(edges[0], Quantity):
+            unit = edges[0].unit
+        if unit is None:
+            raise ValueError("Histogram needs a unit for its edges")
+        super().__init__(unit)
+        base = [e.value * self._factor(e.unit) if isinstance(e, Quantity) else e * self.unit.factor
+                for e in edges]
+        if len(base) < 2 or any(a >= b for a, b in zip(base, base[1:])):
+            raise ValueError("Histogram edges must be at least two increasing values")
+        self._edges = base
+        self.counts = [0] * (len(base) - 1)
+        self.underflow = 0
+        self.overflow = 0
+
+    @property
+    def edges(self):
+        return [Quantity(e / self.unit.factor, self.unit) for e in self._edges]
+
+    def _push(self, value):
+        self.count += 1
+        i = bisect_right(self._edges, value)
+        if i == 0:
+            self.underflow += 1
+        elif i == len(self._edges):
+            self.overflow += 1
+        else:
+            self.counts[i - 1] += 1
+
+    def _push_array(self, values):
+        import numpy as np
+        index = np.searchsorted(self._edges, values, side="right")
+        binned = np.bincount(index, minlength=len(self._edges) + 1)
+        self.underflow += int(binned[0])
+        self.overflow += int(binned[-1])
+        for i, n in enumerate(binned[1:-1].tolist()):
+            self.counts[i] += n
+        self.count += len(values)
+
+    def result(self):
+        return list(self.counts)
@@ -0,0 +1,159 @@
+"""
+物理量数组的二进制文件格式
+
+    save_quantities("run.siq", QuantityArray(values, "mV"))
+    q = load_quantities("run.siq")        # 内存映射的 QuantityArray，不复制数据
+
+    with QuantityWriter("run.siq", "mV") as w:    # 流式写入，append=True 时追加到已有文件
+        w.write(chunk)
+
+文件格式(小端):
+    文件头  magic(8s) 格式版本(I) 文件头长度(I) 换算因子(d) 量纲向量(7d) 单位名长度(H) 单位名(utf-8)，
+            补零到 64 字节的整数倍
+    数据    连续的 float64 数值，个数由文件长度推出，所以追加数据不需要改写文件头
+单位按文件头中的名称、换算因子和量纲向量还原，不逐个解析数值对应的单位。
+"""
+import os
+import struct
+import sys
+from array import array
+
+from .quantity import Quantity
+from .unit import Unit, _restore_unit
+from .unitsystem import UnitSystem
+
+MAGIC = b"SIQARR\0\0"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIId7dH")
+ALIGNMENT = 64
+ITEM_SIZE = 8
+
+
+def _header(unit):
+    name = unit.name.encode("utf-8")
+    size = HEADER.size + len(name)
+    size += -size % ALIGNMENT
+    head = HEADER.pack(MAGIC, FORMAT_VERSION, size, unit.factor, *unit.dim, len(name)) + name
+    return head.ljust(size, b"\0")
+
+
+def _read_header(f, path):
+    """返回 (单位, 文件头长度)"""
+    raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise ValueError(f"Not a quantity array file: {path}")
+    magic, version, size, factor, *rest = HEADER.unpack(raw)
+    dim, name_len = tuple(rest[:7]), rest[7]
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"Not a quantity array file: {path}")
+    name = f.read(name_len).decode("utf-8")
+    dim = UnitSystem.intern_dimension(tuple(int(e) if e == int(e) else e for e in dim))
+    return _restore_unit(name, factor, dim), size
+
+
+def _write_values(f, values):
+    """写入 float64 数值(ndarray、array('d') 或数值序列)"""
+    if hasattr(values, "dtype"):
+        values.astype("<f8", copy=False).tofile(f)
+        return
+    if not isinstance(values, array) or values.typecode != 'd':
+        values = array('d', values)
+    if sys.byteorder == "big":
+        values = array('d', values)
+        values.byteswap()
+    values.tofile(f)
+
+
+class QuantityWriter:
+    """
+    流式写入物理量数组文件，单位在创建时确定
+    append=True 且文件已存在时沿用文件中的单位(给出的 unit 必须与之相同)
+    """
+    def __init__(self, path, unit=None, append=False):
+        if unit is not None and not isinstance(unit, Unit):
+            unit = Unit(unit)
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                file_unit, header = _read_header(f, path)
+            if unit is not None and (unit.dim != file_unit.dim or unit.factor != file_unit.factor):
+                raise ValueError(f"Cannot append {unit} values to {path} stored in {file_unit}")
+            self.unit = file_unit
+            self._file = open(path, "ab")
+            # 截掉上次写入中断留下的不完整数值
+            self._file.truncate(header + (self._file.tell() - header) // ITEM_SIZE * ITEM_SIZE)
+        else:
+            if unit is None:
+                raise ValueError("A unit is required to create a quantity array file")
+            self.unit = unit
+            self._file = open(path, "wb")
+            self._file.write(_header(unit))
+        self.path = path
+
+    def write(self, values):
+        """
+        写入一批数值: QuantityArray 或 Quantity 序列会换算到文件单位，
+        纯数值(ndarray、array('d')、列表)视为文件单位下的值
+        """
+        if isinstance(values, Quantity):
+            factor = Unit.converter(values.unit, self.unit).factor
+            value = values.value
+            values = value * factor if hasattr(value, "dtype") else [value * factor]
+        elif not hasattr(values, "dtype") and not isinstance(values, array):
+            values = list(values)
+            if values and isinstance(values[0], Quantity):
+                factors = {}
+                for i, q in enumerate(values):
+                    factor = factors.get(q.unit)
+                    if factor is None:
+                        factor = factors[q.unit] = Unit.converter(q.unit, self.unit).factor
+                    values[i] = q.value * factor
+        _write_values(self._file, values)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def save_quantities(path, quantities, unit=None):
+    """
+    把一组物理量写入文件
+    quantities 为 QuantityArray、Quantity 序列或数值序列(此时必须给出 unit)；
+    unit 默认为 QuantityArray 或第一个 Quantity 的单位
+    """
+    if unit is None:
+        if isinstance(quantities, Quantity):
+            unit = quantities.unit
+        else:
+            quantities = list(quantities)
+            if not quantities or not isinstance(quantities[0], Quantity):
+                raise ValueError("A unit is required to save plain values")
+            unit = quantities[0].unit
+    with QuantityWriter(path, unit) as writer:
+        writer.write(quantities)
+
+
+def load_quantities(path, mmap=True):
+    """
+    读取物理量数组文件，返回 QuantityArray (需要 numpy)
+    mmap=True 时数值是只读的内存映射，不复制；否则读入内存
+    """
+    import numpy as np
+    from .array import QuantityArray
+
+    with open(path, "rb") as f:
+        unit, header = _read_header(f, path)
+        count = (os.fstat(f.fileno()).st_size - header) // ITEM_SIZE
+        if not mmap or count == 0:
+            f.seek(header)
+            values = np.fromfile(f, dtype="<f8", count=count)
+            return QuantityArray(values, unit)
+    values = np.memmap(path, dtype="<f8", mode="r", offset=header, shape=(count,))
+    return QuantityArray(values, unit)
@@ -1,210 +1,295 @@
 from .unitsystem import UnitSystem
-from collections import defaultdict
-import re
+from .cache import LRUCache
+
+# 进程级单位解析缓存: {规范化表达式: Unit}
+_PARSE_CACHE = LRUCache(maxsize=1024)
+# 单位运算缓存: {(id(a), id(b) 或幂次, 运算): (a, b, 结果)}
+# 结果同样是驻留的实例，所以链式运算也能命中；保留 a、b 的引用以免 id 被复用
+_ALGEBRA_CACHE = LRUCache(maxsize=4096)
+# 换算器缓存: {(id(来源单位), id(目标单位)): 换算函数}，换算函数保留两个单位的引用
+_CONVERTER_CACHE = LRUCache(maxsize=4096)
+
+
+def _compile_converter(source, target):
+    """
+    创建预编译的单位换算函数，converter(x) 等价于 x * factor
+    x 可以是数值或 numpy 数组；量纲检查在创建时完成，调用时只做一次乘法
+    换算函数带有 factor、source、target 属性
+    """
+    if not source.is_compatible(target):
+        raise ValueError(f"Incompatible units: {source} and {target}")
+    factor = source.factor / target.factor
+
+    def converter(value):
+        return value * factor
+
+    converter.__qualname__ = converter.__name__ = f"converter[{source.name} -> {target.name}]"
+    converter.factor = factor
+    converter.source = source
+    converter.target = target
+    return converter
+
+
+# 单位表达式的词法扫描器，首次解析复合表达式时才编译(推迟导入 re 以加快 import SI)
+# 每次匹配一个记号: 符号(可带幂次) | 运算符 | 左括号 | 右括号(可带幂次)
+_SCANNER = None
+
+
+def _scanner():
+    global _SCANNER
+    if _SCANNER is None:
+        import re
+        _SCANNER = re.compile(r"\s*(?:([^\W\d_]+|1)(?:\s*\^\s*([-+]?\d+))?|([*·/])|(\()|(\))(?:\s*\^\s*([-+]?\d+))?)")
+    return _SCANNER
+
+
+# 运算符、括号和 ^ 两侧的空白，扫描器会忽略它们，规范化缓存键时去掉
+_OPERATOR_SPACE = None
+
+
+def _normalize(expr):
+    """缓存键: 去掉首尾及运算符两侧的空白，符号之间的空白保留(如 "m s" 仍是无效表达式)"""
+    global _OPERATOR_SPACE
+    expr = expr.strip()
+    if ' ' not in expr and '\t' not in expr:
+        return expr
+    if _OPERATOR_SPACE is None:
+        import re
+        _OPERATOR_SPACE = re.compile(r"\s*([*·/()^])\s*")
+    return _OPERATOR_SPACE.sub(r"\1", expr)
+
+
+def _scan_terms(expr):
+    """
+    扫描单位表达式，返回 [[符号, 指数], ...]，同一符号可出现多次
+    除号只作用于紧随其后的符号或括号，括号内的项带上括号整体的符号，右括号后的幂次乘到组内各项
+    """
+    match = _scanner().match
+    expr = expr.rstrip()
+    terms = []
+    groups = []            # 未闭合的括号: (组内第一项的下标, 括号外的符号)
+    sign = 1               # 当前括号整体的符号
+    op = 1                 # 下一个因子的符号: 1 为乘，-1 为除
+    expect_operand = True
+    pos = 0
+    while pos < len(expr):
+        m = match(expr, pos)
+        if m is None:
+            raise ValueError(f"Invalid unit expression {expr!r} at position {pos}")
+        symbol, exp, operator, opening, closing, group_exp = m.groups()
+        pos = m.end()
+        if operator is not None:
+            if expect_operand:
+                raise ValueError(f"Invalid unit expression {expr!r}: missing operand before '{operator}'")
+            op = -1 if operator == '/' else 1
+            expect_operand = True
+            continue
+        if (symbol is not None or opening is not None) != expect_operand:
+            raise ValueError(f"Invalid unit expression {expr!r} at position {m.start()}")
+        if symbol is not None:
+            if symbol != '1':
+                terms.append([symbol, sign * op * (int(exp) if exp else 1)])
+            expect_operand = False
+        elif opening:
+            groups.append((len(terms), sign))
+            sign *= op
+            op = 1
+        else:
+            if not groups:
+                raise ValueError(f"Invalid unit expression {expr!r}: unbalanced ')'")
+            start, sign = groups.pop()
+            if group_exp:
+                power = int(group_exp)
+                for term in terms[start:]:
+                    term[1] *= power
+    if expect_operand or groups:
+        raise ValueError(f"Invalid unit expression {expr!r}: unexpected end")
+    return terms
+
+
+class _UnitMeta(type):
+    """
+    仅由表达式构造的 Unit (如 Unit("km/h")) 走解析缓存，
+    相同表达式返回同一个(驻留的) Unit 实例，不要修改其属性
+    """
+    def __call__(cls, name, factor=1.0, base_units=None, prefer_derived=True):
+        if base_units is not None or not prefer_derived or not isinstance(name, str):
+            return super().__call__(name, factor, base_units, prefer_derived)
+        key = _normalize(name)
+        # 计算前读取版本，写入时版本已变化的结果不缓存
+        version = UnitSystem._version
+        _PARSE_CACHE.validate(version)
+        unit = _PARSE_CACHE.get(key)
+        if unit is None:
+            # 预编译快照中有的符号和常用表达式不需要解析
+            snapshot = UnitSystem.snapshot()
+            if snapshot is not None:
+                unit = snapshot.unit(key)
+            if unit is None:
+                unit = super().__call__(name)
+            _PARSE_CACHE.put(key, unit, version)
+        return unit
 
-class Unit:
-    def __init__(self, name, factor=1.0, base_units=None, prefer_derived=True):
-        self.name = name
-        self.factor = factor
-        self.prefer_derived = prefer_derived
-        self._unitdict_raw = None
 
+class Unit(metaclass=_UnitMeta):
+    """
+    物理单位，不可变，可作为字典键或在多线程间共享
+    相等(及哈希)只比较量纲和换算因子，如 Unit("N*m") == Unit("J")
+    """
+    __slots__ = ('_name', 'factor', 'dim', '_unitdict_raw', 'prefer_derived', '_derived', '_hash')
+
+    def __init__(self, name, factor=1.0, base_units=None, prefer_derived=True):
         expr = name.strip()
         # 判断是否有乘除等运算符
         if not any(op in expr for op in ('*', '·', '/', '(', ')', '^')):
             # 没有运算符，直接用_basical_unit
             u = self._basical_unit(expr)
-            self.name = u.name
-            self.factor = u.factor
-            self.base_units = u.base_units
-            self._unitdict_raw = u._unitdict_raw
-            return
-        if base_units is None:
+        elif base_units is None:
             # 新增：用表达式解析器
             u = self.parse_expr(name)
-            self.name = u.name
-            self.factor = u.factor
-            self.base_units = u.base_units
-            self._unitdict_raw = u._unitdict_raw
         else:
-            self.base_units = dict(base_units)  # <--- 补上这句，确保是字典
-            self._unitdict_raw = {k: v for k, v in base_units.items() if v != 0}
+            self._assign(name, factor, UnitSystem.to_dimension(base_units),
+                         {k: v for k, v in base_units.items() if v != 0}, prefer_derived)
+            return
+        self._assign(u._name, u.factor, u.dim, u._unitdict_raw, prefer_derived)
+
+    def _assign(self, name, factor, dim, unitdict, prefer_derived=True):
+        """构造时一次性写入全部属性，之后实例不可修改"""
+        setattr_ = object.__setattr__
+        setattr_(self, '_name', name)
+        setattr_(self, 'factor', factor)
+        setattr_(self, 'dim', dim)
+        setattr_(self, '_unitdict_raw', unitdict)
+        setattr_(self, 'prefer_derived', prefer_derived)
+        setattr_(self, '_derived', None)
+        # 不可变，哈希值只计算一次
+        setattr_(self, '_hash', hash((dim, factor)))
+
+    @classmethod
+    def _make(cls, name, factor, dim, unitdict):
+        obj = cls.__new__(cls)   # 跳过 __init__
+        obj._assign(name, factor, dim, unitdict)
+        return obj
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __reduce__(self):
+        # 只序列化规范名称、换算因子和量纲向量，反序列化时重新驻留为 Unit(name)
+        return (_restore_unit, (self.name, self.factor, self.dim))
+
+    @property
+    def name(self):
+        """单位名称，运算产生的单位在首次访问时才生成名称字符串"""
+        name = self._name
+        if name is None:
+            name = UnitSystem.units_to_string(self._unitdict_raw)
+            object.__setattr__(self, '_name', name)
+        return name
+
+    @property
+    def base_units(self):
+        """基本单位表达式，如 {'m': 1, 's': -1}，由量纲向量生成"""
+        return UnitSystem.from_dimension(self.dim)
+
+    @staticmethod
+    def cache_info():
+        """返回解析缓存统计 (hits, misses, evictions, maxsize, currsize)"""
+        return _PARSE_CACHE.info()
+
+    @staticmethod
+    def cache_clear():
+        """清空解析缓存"""
+        _PARSE_CACHE.clear()
+
+    @staticmethod
+    def set_cache_size(maxsize):
+        """设置解析缓存容量，None 表示不限大小，0 表示关闭缓存"""
+        _PARSE_CACHE.resize(maxsize)
+
     @classmethod
     def parse_expr(cls, expr):
         """
         解析复杂单位表达式，返回Unit对象
-        支持括号、乘除、幂次
+        支持括号(可带幂次，如 (m/s)^2)、乘除(*、·、/)、整数幂次(如 s^-2)和 1/x
+        单遍扫描，只累积各符号的指数，最后才创建一个 Unit
         """
-        def to_rpn(expr):
-            # 表达式转逆波兰
-            expr = expr.replace(' ', '')
-            tokens = re.findall(r'[A-Za-zμ1]+(?:\^\-?\d+)?|\d+|[·*/()]', expr)
-            output = []
-            stack = []
-            precedence = {'*': 1, '·': 1, '/': 1}
-            for token in tokens:
-                if re.match(r'[A-Za-zμ1]+(?:\^\-?\d+)?', token):
-                    output.append(token)
-                elif token in ('*', '·', '/'):
-                    while stack and stack[-1] != '(' and precedence.get(stack[-1], 0) >= precedence[token]:
-                        output.append(stack.pop())
-                    stack.append(token)
-                elif token == '(':
-                    stack.append(token)
-                elif token == ')':
-                    while stack and stack[-1] != '(':
-                        output.append(stack.pop())
-                    stack.pop()
-            while stack:
-                output.append(stack.pop())
-            return output
-
-        def eval_rpn(rpn):
-            stack = []
-            for token in rpn:
-                if re.match(r'[A-Za-zμ1]+(?:\^\-?\d+)?', token):
-                    if '^' in token:
-                        base, exp = token.split('^')
-                        u = Unit(base)
-                        stack.append(u ** int(exp))
-                    else:
-                        stack.append(Unit(token))
-                elif token in ('*', '·'):
-                    if len(stack) < 2:
-                        raise ValueError(f"Invalid expression: not enough operands for '{token}'")
-                    b = stack.pop()
-                    a = stack.pop()
-                    stack.append(a * b)
-                elif token == '/':
-                    if len(stack) < 2:
-                        raise ValueError(f"Invalid expression: not enough operands for '/'")
-                    b = stack.pop()
-                    a = stack.pop()
-                    stack.append(a / b)
-            if len(stack) != 1:
-                raise ValueError(f"Invalid expression: leftover stack {stack}")
-            return stack[0]
-
-        rpn = to_rpn(expr)
-        # print(f"RPN: {rpn}")
-        return eval_rpn(rpn)
-
-    def _build_from_unitdict(self):
+        exps = {}
+        for symbol, exp in _scan_terms(expr):
+            exps[symbol] = exps.get(symbol, 0) + exp
+        return cls._from_unitdict({k: v for k, v in exps.items() if v != 0} or {'1': 1})
+
+    @staticmethod
+    def _resolve_unitdict(unitdict, dim=None):
         """
-        根据 _unitdict_raw 展开到基本单位，并计算总 factor。
+        根据单位指数字典计算总 factor 和量纲向量，返回 (factor, dim)
+        dim 已知时(如单位相乘时量纲向量直接相加)只计算 factor
         """
-        expanded = defaultdict(int)
-        total_factor = self.factor   # 外部可能已乘过一个因子
+        total_factor = 1.0
+        expanded = None if dim is not None else [0] * 7
 
-        for unit, exp in self._unitdict_raw.items():
+        for unit, exp in unitdict.items():
             if unit == '1':
                 continue
-
-            # f, base 
-            baseunit = self._basical_unit(unit)
-            f= baseunit.factor
-            base = baseunit.base_units
+            f, unit_dim = UnitSystem.lookup(unit)
             total_factor *= f ** exp
-            for b, e in base.items():
-                expanded[b] += e * exp
-        # 清除指数为0的单位
-        expanded = {k: v for k, v in expanded.items() if v != 0 and k != '1'}
-        if not expanded:
-            expanded = {'1': 1} 
-        
-        self.base_units = dict(expanded)
-        self.factor = total_factor
-        # self.base_units = self._unitdict_expanded
-
+            if expanded is not None:
+                for i, e in enumerate(unit_dim):
+                    if e:
+                        expanded[i] += e * exp
+        if expanded is not None:
+            dim = UnitSystem.intern_dimension(tuple(expanded))
+        return total_factor, dim
 
     @classmethod
-    def _from_unitdict(cls, unitdict):
+    def _from_unitdict(cls, unitdict, dim=None):
         unitdict = {k: v for k, v in unitdict.items() if v != 0}
-        obj = cls.__new__(cls)   # 跳过 __init__
-        obj._unitdict_raw = dict(unitdict)
-        obj.name = UnitSystem.units_to_string(unitdict)
-        obj.factor = 1.0
-        obj._build_from_unitdict()
-        return obj
+        factor, dim = cls._resolve_unitdict(unitdict, dim)
+        # 名称在首次访问时生成，见 name 属性
+        return cls._make(None, factor, dim, unitdict)
 
     @classmethod
-    def _basical_unit(cls,unit_name):
-
-        if unit_name == '1':
-            obj = cls.__new__(cls)
-            obj._unitdict_raw = {'1': 1}
-            obj.name = '1'
-            obj.factor = 1.0
-            obj.base_units = {'1': 1}
-            return obj
-    
-        obj = cls.__new__(cls)
-        obj._unitdict_raw = dict({unit_name: 1})
-        obj.name = unit_name
-
-        if unit_name in UnitSystem.BASE_UNITS:
-            obj.factor = 1.0
-            obj.base_units = {unit_name: 1}
-            return obj
-
-        if unit_name in UnitSystem.DERIVED_UNITS:
-            factor, base = UnitSystem.DERIVED_UNITS[unit_name]
-            obj.factor = factor
-            obj.base_units = base.copy()
-            return obj
-
-        if unit_name in UnitSystem.English_UNITS:
-            factor, base = UnitSystem.English_UNITS[unit_name]
-            obj.factor = factor
-            obj.base_units = base.copy()
-            return obj
-
-        # 带词头单位
-        for prefix, factor in sorted(UnitSystem.PREFIXES.items(), key=lambda x: -len(x[0])):
-            if unit_name.startswith(prefix):
-                base_name = unit_name[len(prefix):]
-                baseunit = Unit._basical_unit(base_name)
-                obj.factor = factor * baseunit.factor
-                obj.base_units = baseunit.base_units.copy()
-                return obj
-                # return factor * f, base
-
-        raise ValueError(f"Undefined unit: {unit_name}")
+    def _basical_unit(cls, unit_name):
+        factor, dim = UnitSystem.lookup(unit_name)
+        return cls._make(unit_name, factor, dim, {unit_name: 1})
+
     def to_derived_unit(self):
         """
         返回 (换算因子, 导出单位)
+        结果缓存在实例上，驻留的单位重复化简时直接返回
         """
+        version = UnitSystem._version
+        cached = self._derived
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        result = self._derive()
+        object.__setattr__(self, '_derived', (version, result))
+        return result
+
+    def _derive(self):
         # 单量纲且只有1阶
         new_base = {k: v for k, v in self._unitdict_raw.items() if v != 0 and k != '1'}
         if len(new_base) == 1 and sum(new_base.values()) == 1:
             return 1, self
 
-        normalized_base = {k: v for k, v in sorted(self.base_units.items()) if v != 0}
-        if len(normalized_base) == 1 and sum(normalized_base.values()) == 1:
-            unit_name = next(iter(normalized_base))
-            return self.factor, Unit(unit_name)
-        #     return 1, self
-        # 1. 首先尝试查找精确匹配
-        for unit_name, (factor, unit_def) in UnitSystem.DERIVED_UNITS.items():
-            if unit_def == normalized_base:
-                return self.factor/factor, Unit(unit_name)
-
-        if not normalized_base or normalized_base == {'1': 1}:
-            return 1, Unit("1")
+        # 按量纲向量查反向索引: 基本单位、命名导出单位或无量纲
+        match = UnitSystem.find_derived_unit(self.dim)
+        if match is not None:
+            factor, unit_name = match
+            return self.factor / factor, Unit(unit_name)
 
-        # 量纲约化
+        # 量纲约化: 同量纲的单位合并到最先出现的那个
         units_temp = {}
+        first_by_dim = {}
         for unit_name, exp in self._unitdict_raw.items():
             if exp != 0:
-                kt = 0
-                for unit, exp2 in units_temp.items():
-                    if Unit(unit).is_compatible(unit_name):
-                        units_temp[unit] += exp
-                        kt = 1
-                        break
-                if not kt:
-                    units_temp[unit_name] = exp
-        uunit = Unit._from_unitdict(units_temp)
+                dim = UnitSystem.lookup(unit_name)[1]
+                unit = first_by_dim.setdefault(dim, unit_name)
+                units_temp[unit] = units_temp.get(unit, 0) + exp
+        uunit = Unit._from_unitdict(units_temp, self.dim)
         return self.factor / uunit.factor, uunit
     # def to_derived_unit(self):
     #     return self.convert_to(UnitSystem.find_derived_unit(self))
@@ -216,45 +301,90 @@ class Unit:
         return self.factor, base_unit
     
     def convert_to(self, target_unit):
-        """转换到目标单位"""
-        if not isinstance(target_unit, Unit):
-            target_unit = Unit(target_unit)
-        if not self.is_compatible(target_unit):
-            raise ValueError(f"Incompatible units: {self} and {target_unit}")
-        
-        return self.factor / target_unit.factor
+        """转换到目标单位，返回换算因子"""
+        return Unit.converter(self, target_unit).factor
+
+    @staticmethod
+    def converter(source, target):
+        """
+        返回从 source 到 target 的预编译换算函数，如
+            kmh_to_ms = Unit.converter("km/h", "m/s")
+            kmh_to_ms(36)   # 10.0
+        相同的 (source, target) 共享缓存中的同一个换算器
+        """
+        if not isinstance(source, Unit):
+            source = Unit(source)
+        if not isinstance(target, Unit):
+            target = Unit(target)
+        key = (id(source), id(target))
+        version = UnitSystem._version
+        _CONVERTER_CACHE.validate(version)
+        converter = _CONVERTER_CACHE.get(key)
+        if converter is None:
+            converter = _compile_converter(source, target)
+            _CONVERTER_CACHE.put(key, converter, version)
+        return converter
     
+    # numpy 数组 * 单位时交给 __rmul__ 处理，而不是逐元素相乘
+    __array_ufunc__ = None
+
     def __rmul__(self, other):
-        """支持标量 * 单位 (如 5 * m)"""
+        """支持标量 * 单位 (如 5 * m)，numpy 数组 * 单位得到 QuantityArray"""
+        if getattr(other, 'ndim', 0):
+            from .array import QuantityArray
+            return QuantityArray(other, self)
         from .quantity import Quantity
         return Quantity(other, self)
     
     def __mul__(self, other):
         if isinstance(other, Unit):
-            new_base = defaultdict(int)
-            for unit, exp in self._unitdict_raw.items():
-                new_base[unit] += exp
-            for unit, exp in other._unitdict_raw.items():
-                new_base[unit] += exp
-            # 清除指数为0的单位
-            new_base = {k: v for k, v in new_base.items() if v != 0 and k != '1'}
-            if not new_base:
-                new_base = {'1': 1}
-            return Unit._from_unitdict(new_base)
+            return self._combine(other, 1)
         elif isinstance(other, (int, float)):
             return other * self
 
+    def _combine(self, other, sign):
+        """单位相乘(sign=1)或相除(sign=-1): 合并单位指数，量纲向量相加减"""
+        key = (id(self), id(other), sign)
+        version = UnitSystem._version
+        _ALGEBRA_CACHE.validate(version)
+        hit = _ALGEBRA_CACHE.get(key)
+        if hit is not None:
+            return hit[2]
+        new_base = dict(self._unitdict_raw)
+        for unit, exp in other._unitdict_raw.items():
+            new_base[unit] = new_base.get(unit, 0) + sign * exp
+        # 清除指数为0的单位
+        new_base = {k: v for k, v in new_base.items() if v != 0 and k != '1'}
+        if not new_base:
+            new_base = {'1': 1}
+        if sign > 0:
+            dim = tuple([a + b for a, b in zip(self.dim, other.dim)])
+        else:
+            dim = tuple([a - b for a, b in zip(self.dim, other.dim)])
+        result = Unit._from_unitdict(new_base, UnitSystem.intern_dimension(dim))
+        _ALGEBRA_CACHE.put(key, (self, other, result), version)
+        return result
+
     def __pow__(self, power):
+        key = (id(self), power, '**')
+        version = UnitSystem._version
+        _ALGEBRA_CACHE.validate(version)
+        hit = _ALGEBRA_CACHE.get(key)
+        if hit is not None:
+            return hit[2]
         new_base = {unit: exp * power for unit, exp in self._unitdict_raw.items()}
         new_base = {k: v for k, v in new_base.items() if v != 0 and k != '1'}
         if not new_base:
             new_base = {'1': 1}
-        return Unit._from_unitdict(new_base)
+        dim = UnitSystem.intern_dimension(tuple(e * power for e in self.dim))
+        result = Unit._from_unitdict(new_base, dim)
+        _ALGEBRA_CACHE.put(key, (self, power, result), version)
+        return result
     
     def __truediv__(self, other):
         """支持单位 / 单位"""
         if isinstance(other, Unit):
-            return self * (other ** -1)
+            return self._combine(other, -1)
         else:
             # 支持单位 / 标量 (如 m / 5)
             from .quantity import Quantity
@@ -274,11 +404,28 @@ class Unit:
     def __eq__(self, other):
         if not isinstance(other, Unit):
             return False
-        return self.base_units == other.base_units and self.factor == other.factor
+        return self.dim == other.dim and self.factor == other.factor
+
+    def __hash__(self):
+        return self._hash
     
     def is_compatible(self, other):
         if not isinstance(other, Unit):
             other = Unit(other)
-        if not isinstance(self.base_units, dict) or not isinstance(other.base_units, dict):
-            raise TypeError("base_units must be dict for compatibility check")
-        return self.base_units == other.base_units
\ No newline at end of file
+        # 量纲向量已驻留，绝大多数情况下一次 is 比较即可
+        return self.dim is other.dim or self.dim == other.dim
+
+
+def _restore_unit(name, factor, dim):
+    """
+    由名称、换算因子和量纲向量还原 Unit: 名称解析出相同的单位时返回驻留的 Unit(name)，
+    名称无法解析或定义不同(如本进程未注册该单位)时按换算因子和量纲向量重建
+    """
+    try:
+        unit = Unit(name)
+    except ValueError:
+        unit = None
+    if unit is not None and unit.factor == factor and unit.dim == dim:
+        return unit
+    dim = UnitSystem.intern_dimension(tuple(dim))
+    return Unit._make(name, factor, dim, UnitSystem.from_dimension(dim))
@@ -1,9 +1,40 @@
-from collections import defaultdict
-import re
+from _thread import allocate_lock
+
+
+class _Registry:
+    """
+    某一版本的单位表: 各单位表的副本及由它们生成的索引
+    发布后单位表不再改变，索引只会按需填充与单位表一致的条目，多线程读取不需要加锁
+    """
+    __slots__ = ('version', 'prefixes', 'derived', 'english', 'aliases', 'preferred',
+                 'symbols', 'partial', 'derived_index', 'sorted_prefixes')
+
+    def __init__(self, version, prefixes, derived, english, aliases, preferred):
+        self.version = version
+        self.prefixes = dict(prefixes)
+        self.derived = {name: (factor, dict(base)) for name, (factor, base) in derived.items()}
+        self.english = {name: (factor, dict(base)) for name, (factor, base) in english.items()}
+        self.aliases = dict(aliases)
+        self.preferred = dict(preferred)
+        # 完整的符号索引: {单位符号(含词头): (换算因子, 量纲向量)}，首次查找时构建
+        self.symbols = None
+        # 有预编译快照时先用的部分索引，按需从快照填充
+        self.partial = {}
+        # 反向索引: {量纲向量: (换算因子, 首选单位名)}
+        self.derived_index = None
+        # 按长度降序排列的词头，供嵌套词头(如 'mkg')回退查找
+        self.sorted_prefixes = tuple(sorted(self.prefixes.items(), key=lambda x: -len(x[0])))
+
+
 
 class UnitSystem:
     # 七个基本物理量
     BASE_UNITS = {'m', 'kg', 's', 'A', 'K', 'mol', 'cd'}
+    # 量纲向量中各基本单位的位置
+    DIMENSION_ORDER = ('m', 'kg', 's', 'A', 'K', 'mol', 'cd')
+    _DIMENSION_SLOT = {name: i for i, name in enumerate(DIMENSION_ORDER)}
+    # 无量纲
+    DIMENSIONLESS = (0, 0, 0, 0, 0, 0, 0)
     
     # 单位词头
     PREFIXES = {
@@ -99,21 +130,17 @@ class UnitSystem:
         # 'quart': (0.946352946, {'m': 1}),  # 美制夸脱
         'pint': (0.473176473e-3, {'m': 1}),  # 美制品脱
     }
-    # 单位别名映射
-    UNIT_ALIASES = {
-        '1/s': 'Hz',
-        'kg·m/s^2': 'N',
-        'N·m': 'J',
-        'J/s': 'W',
-        'kg/(m·s^2)': 'Pa',
-        'C/s': 'A',
-        'W/A': 'V',
-        'J/C': 'V',
-        'V/A': 'Ohm',
-        'Wb/m^2': 'T',
-        'J/kg': 'Gy',
-    }
+    # 单位别名: {别名: 单位表达式}，用 register_alias 注册
+    # 别名为单个符号，像单位一样参与查找(可带词头)
+    UNIT_ALIASES = {}
     
+    # 自动选择词头(Quantity.to_engineering)时不加词头的单位，英制单位也不加词头
+    UNPREFIXED_UNITS = {'min', 'h', 'day', 'year', 't', 'u', 'AU', 'lyr', 'atm', 'kWh'}
+    # 自动选择词头时换成的基准单位，如 kg 的词头加在 g 上
+    PREFIX_BASES = {'kg': 'g', 'cm': 'm', 'dm': 'm'}
+    # 自动选择词头时各量纲的首选单位: {量纲向量: 单位名}，用 set_preferred_unit 设置
+    PREFERRED_UNITS = {}
+
     # # 特殊字符映射
     # SPECIAL_CHARS = {
     #     '°': 'deg',
@@ -123,6 +150,42 @@ class UnitSystem:
     #     'Ohm': 'Ohm',
     # }
     
+    # 当前发布的单位表(_Registry)，读取方只读这一个属性，不加锁
+    _registry = None
+    # 发布新单位表时的写锁
+    _write_lock = allocate_lock()
+    # 预编译注册表快照(见 registry.py)，首次查找时加载；False 表示没有可用的快照
+    _snapshot = None
+    # 单位表版本号，每次发布新单位表时递增，供各级缓存判断是否失效
+    _version = 0
+
+    # 驻留的量纲向量，相同量纲共享同一个元组对象
+    _dimensions = {DIMENSIONLESS: DIMENSIONLESS}
+
+    @classmethod
+    def intern_dimension(cls, dim):
+        """返回驻留的量纲向量，相同量纲可直接用 is 比较"""
+        return cls._dimensions.setdefault(dim, dim)
+
+    @classmethod
+    def to_dimension(cls, base_units):
+        """基本单位表达式 {'kg': 1, 'm': 2, 's': -2} -> 七维量纲向量"""
+        dim = [0] * 7
+        for unit, exp in base_units.items():
+            if unit == '1':
+                continue
+            try:
+                dim[cls._DIMENSION_SLOT[unit]] += exp
+            except KeyError:
+                raise ValueError(f"Not a base unit: {unit}") from None
+        return cls.intern_dimension(tuple(dim))
+
+    @classmethod
+    def from_dimension(cls, dim):
+        """七维量纲向量 -> 基本单位表达式，无量纲时为 {'1': 1}"""
+        base_units = {name: exp for name, exp in zip(cls.DIMENSION_ORDER, dim) if exp != 0}
+        return base_units or {'1': 1}
+
     @classmethod
     def is_base_unit(cls, unit_name):
         return unit_name in cls.BASE_UNITS
@@ -130,11 +193,249 @@ class UnitSystem:
     @classmethod
     def get_unit_definition(cls, unit_name):
         return cls.DERIVED_UNITS.get(unit_name, None)
-    
 
-        # 4. 尝试匹配无量纲单位
+    @classmethod
+    def _unit_tables(cls, reg):
+        """按查找优先级从低到高返回 (单位名, 换算因子, 量纲向量)"""
+        for name, (factor, base) in reg.english.items():
+            yield name, factor, cls.to_dimension(base)
+        for name, (factor, base) in reg.derived.items():
+            yield name, factor, cls.to_dimension(base)
+        for name in cls.BASE_UNITS:
+            yield name, 1.0, cls.to_dimension({name: 1})
+
+    @classmethod
+    def _resolve(cls, index, expr):
+        """按符号索引解析单位表达式，返回 (换算因子, 量纲向量)"""
+        from .unit import _scan_terms
+        factor, dim = 1.0, [0] * 7
+        for symbol, exp in _scan_terms(expr):
+            try:
+                sfactor, sdim = index[symbol]
+            except KeyError:
+                raise ValueError(f"Undefined unit: {symbol}") from None
+            factor *= sfactor ** exp
+            for i, e in enumerate(sdim):
+                dim[i] += e * exp
+        return factor, cls.intern_dimension(tuple(dim))
+
+    @classmethod
+    def _full_index(cls, reg):
+        """由 reg 中的单位表、词头和别名构建完整的符号索引"""
+        units = list(cls._unit_tables(reg))
+        index = {}
+        # 长词头后写入，与逐个匹配时优先最长词头一致
+        for prefix, pfactor in sorted(reg.prefixes.items(), key=lambda x: len(x[0])):
+            for name, factor, dim in units:
+                index[prefix + name] = (pfactor * factor, dim)
+        # 无词头单位优先于词头组合
+        for name, factor, dim in units:
+            index[name] = (factor, dim)
+        index['1'] = (1.0, cls.DIMENSIONLESS)
+        # 别名按注册顺序解析，不覆盖已有的符号(单位及其词头组合)；别名的词头组合同样不覆盖
+        for alias, target in reg.aliases.items():
+            if not alias.isalpha() or alias in index:
+                continue
+            factor, dim = index[alias] = cls._resolve(index, target)
+            for prefix, pfactor in reg.sorted_prefixes:
+                index.setdefault(prefix + alias, (pfactor * factor, dim))
+        reg.symbols = index
+        return index
+
+    @classmethod
+    def rebuild_index(cls):
+        """由当前发布的单位表重建完整的符号索引并返回"""
+        return cls._full_index(cls._registry)
 
-    
+    @classmethod
+    def snapshot(cls):
+        """返回可用的预编译注册表快照，没有或单位表已修改时返回 None"""
+        snapshot = cls._snapshot
+        if snapshot is None:
+            from .registry import load_default
+            snapshot = load_default()
+            if snapshot is None:
+                cls._snapshot = snapshot = False
+        if snapshot and snapshot.active:
+            return snapshot
+        return None
+
+    @classmethod
+    def _build_derived_index(cls, reg):
+        derived = {}
+        # 同量纲时 DERIVED_UNITS 中靠前的优先(J 优先于 eV)
+        for name, (factor, base) in reg.derived.items():
+            derived.setdefault(cls.to_dimension(base), (factor, name))
+        # 单个基本单位的一次方优先用基本单位表示(m 而不是 cm)
+        for name in cls.BASE_UNITS:
+            derived[cls.to_dimension({name: 1})] = (1.0, name)
+        derived[cls.DIMENSIONLESS] = (1.0, '1')
+        reg.derived_index = derived
+        return derived
+
+    @classmethod
+    def find_derived_unit(cls, dim):
+        """
+        按量纲向量查找首选的命名单位，返回 (换算因子, 单位名)
+        没有对应的命名单位时返回 None
+        """
+        reg = cls._registry
+        derived = reg.derived_index
+        if derived is None:
+            derived = cls._build_derived_index(reg)
+        return derived.get(dim)
+
+    @classmethod
+    def lookup(cls, unit_name):
+        """
+        查找单个单位符号，返回 (换算因子, 量纲向量)
+        未定义时抛出 ValueError
+        """
+        reg = cls._registry
+        index = reg.symbols
+        entry = (reg.partial if index is None else index).get(unit_name)
+        if entry is not None:
+            return entry
+        return cls._lookup(reg, unit_name)
+
+    @classmethod
+    def _lookup(cls, reg, unit_name):
+        index = reg.symbols
+        if index is None:
+            # 有可用的快照时先按需填充部分索引，快照中没有的符号再构建完整索引
+            snapshot = cls.snapshot()
+            if snapshot is not None and snapshot.version == reg.version:
+                entry = snapshot.lookup(unit_name)
+                if entry is not None:
+                    reg.partial[unit_name] = entry
+                    return entry
+            index = cls._full_index(reg)
+        try:
+            return index[unit_name]
+        except KeyError:
+            pass
+        # 嵌套词头等索引外符号，逐个词头回退查找
+        for prefix, pfactor in reg.sorted_prefixes:
+            if unit_name.startswith(prefix) and len(unit_name) > len(prefix):
+                factor, dim = cls._lookup(reg, unit_name[len(prefix):])
+                entry = index[unit_name] = (pfactor * factor, dim)
+                return entry
+        raise ValueError(f"Undefined unit: {unit_name}")
+
+    @classmethod
+    def _next_registry(cls):
+        """由当前的单位表生成下一个版本的单位表(尚未发布)"""
+        return _Registry(cls._version + 1, cls.PREFIXES, cls.DERIVED_UNITS, cls.English_UNITS,
+                         cls.UNIT_ALIASES, cls.PREFERRED_UNITS)
+
+    @classmethod
+    def _publish(cls, reg):
+        """发布新的单位表；先替换快照再更新版本号，读到新版本号的线程一定能读到新快照"""
+        cls._registry = reg
+        cls._version = reg.version
+
+    @classmethod
+    def register_unit(cls, name, factor, base_units, english=False):
+        """
+        注册(或重新定义)单位并发布新的单位表，可以在多个线程中调用
+        base_units 为基本单位表达式，如 {'kg': 1, 'm': 2, 's': -2}；english=True 时归入英制单位表
+        """
+        dim = cls.to_dimension(base_units)
+        with cls._write_lock:
+            attr = 'English_UNITS' if english else 'DERIVED_UNITS'
+            table = dict(getattr(cls, attr))
+            table[name] = (factor, dict(base_units))
+            setattr(cls, attr, table)
+            old = cls._registry
+            reg = cls._next_registry()
+            # 新增符号时在旧索引的副本上增量更新；覆盖已有符号时依赖它的符号都需要重新计算
+            index = old.symbols
+            if index is not None and name not in index:
+                index = dict(index)
+                for prefix, pfactor in reg.prefixes.items():
+                    index.setdefault(prefix + name, (pfactor * factor, dim))
+                index[name] = (factor, dim)
+                reg.symbols = index
+                if old.derived_index is not None:
+                    derived = dict(old.derived_index)
+                    if not english:
+                        derived.setdefault(dim, (factor, name))
+                    reg.derived_index = derived
+            cls._publish(reg)
+
+    @classmethod
+    def register_prefix(cls, prefix, factor):
+        """注册(或重新定义)词头并发布新的单位表，可以在多个线程中调用"""
+        with cls._write_lock:
+            old = cls._registry
+            prefixes = dict(cls.PREFIXES)
+            prefixes[prefix] = factor
+            cls.PREFIXES = prefixes
+            reg = cls._next_registry()
+            # 多字符词头会改变最长词头匹配的结果，需要重建索引
+            index = old.symbols
+            if index is not None and prefix not in old.prefixes and len(prefix) == 1:
+                index = dict(index)
+                for name, ufactor, dim in cls._unit_tables(reg):
+                    index.setdefault(prefix + name, (factor * ufactor, dim))
+                for alias in reg.aliases:
+                    entry = index.get(alias)
+                    if entry is not None:
+                        index.setdefault(prefix + alias, (factor * entry[0], entry[1]))
+                reg.symbols = index
+                reg.derived_index = old.derived_index
+            cls._publish(reg)
+
+    @classmethod
+    def register_alias(cls, alias, target):
+        """
+        注册单位别名并发布新的单位表，如 register_alias('Ω', 'Ohm')
+        别名为单个符号，可以带词头(如 'kΩ')，不能与已有的单位或带词头的符号同名；
+        target 为任意单位表达式，注册时检查能否解析
+        """
+        if not alias.isalpha():
+            raise ValueError(f"Unit alias must be a single symbol: {alias!r}")
+        with cls._write_lock:
+            reg = cls._registry
+            index = reg.symbols or cls._full_index(reg)
+            # 已有的单位或带词头的符号(如 'km')不能被别名重新定义；已注册的别名可以修改目标
+            if alias not in reg.aliases and alias in index:
+                raise ValueError(f"Unit alias {alias!r} is already a unit symbol")
+            cls._resolve(index, target)
+            aliases = dict(cls.UNIT_ALIASES)
+            aliases[alias] = target
+            cls.UNIT_ALIASES = aliases
+            cls._publish(cls._next_registry())
+
+    @classmethod
+    def set_preferred_unit(cls, unit, preferred=True):
+        """
+        设置自动选择词头时该单位所在量纲的首选单位(如能量用 eV 而不是 J)，并发布新的单位表
+        unit 为不带词头的单个符号；preferred=False 时取消该量纲的设置
+        """
+        dim = cls.lookup(unit)[1]
+        with cls._write_lock:
+            old = cls._registry
+            table = dict(cls.PREFERRED_UNITS)
+            if preferred:
+                table[dim] = unit
+            else:
+                table.pop(dim, None)
+            cls.PREFERRED_UNITS = table
+            reg = cls._next_registry()
+            # 单位表没有变化，沿用已建好的索引
+            reg.symbols, reg.partial, reg.derived_index = old.symbols, old.partial, old.derived_index
+            cls._publish(reg)
+
+    # 兼容旧名称
+    define_unit = register_unit
+    define_prefix = register_prefix
+
+    @classmethod
+    def invalidate(cls):
+        """直接修改单位表后调用，发布新的单位表，下次查找时重建索引"""
+        with cls._write_lock:
+            cls._publish(cls._next_registry())
     @classmethod
     def units_to_string(cls, base_units):
         """将基本单位表达式转换为字符串表示"""
@@ -168,4 +469,8 @@ class UnitSystem:
             if len(denominator) > 1:
                 return f"{num_str}/({den_str})"
             return f"{num_str}/{den_str}"
-        return num_str
\ No newline at end of file
+        return num_str
+
+
+UnitSystem._registry = _Registry(0, UnitSystem.PREFIXES, UnitSystem.DERIVED_UNITS, UnitSystem.English_UNITS,
+                                 UnitSystem.UNIT_ALIASES, UnitSystem.PREFERRED_UNITS)
@@ -0,0 +1,137 @@
+"""
+物理量流的紧凑二进制编码，用于进程间队列、套接字等
+
+    encoder = WireEncoder()
+    data = encoder.encode(quantities)      # bytes，一帧
+    decoder = WireDecoder()
+    decoder.decode(data)                   # [Quantity, ...]，单位重新驻留为 Unit(name)
+
+同一对编码器/解码器之间，每种单位(名称、换算因子和量纲向量相同)只在第一次出现的帧中发送一次定义，之后只发送单位编号；
+每个数据为 float64 数值 + uint16 单位编号，共 10 字节。dumps()/loads() 编码单独的一帧。
+
+帧格式(小端):
+    帧头      magic(2s) 格式版本(B) 新单位个数(H) 数据个数(I)
+    单位定义  编号(H) 换算因子(d) 量纲向量(7d，可以是分数) 名称长度(B) 名称(utf-8)
+    数值      数据个数 x float64
+    单位编号  数据个数 x uint16
+"""
+import struct
+import sys
+from array import array
+
+from .quantity import Quantity
+from .unit import _restore_unit
+from .unitsystem import UnitSystem
+
+MAGIC = b"SQ"
+FORMAT_VERSION = 2
+FRAME = struct.Struct("<2sBHI")
+UNIT = struct.Struct("<Hd7dB")
+MAX_UNITS = 0xFFFF
+
+
+def _little_endian(values):
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class WireEncoder:
+    """编码一串帧，记住已发送过定义的单位"""
+    def __init__(self):
+        # {(名称, 换算因子, 量纲向量): 编号}，相等的单位对象共用一个编号
+        self._codes = {}
+
+    def _code(self, unit, definitions):
+        key = (unit.name, unit.factor, unit.dim)
+        code = self._codes.get(key)
+        if code is not None:
+            return code
+        code = len(self._codes)
+        if code >= MAX_UNITS:
+            raise ValueError(f"Too many distinct units in one stream (max {MAX_UNITS})")
+        name = unit.name.encode("utf-8")
+        if len(name) > 255:
+            raise ValueError(f"Unit name too long to encode: {unit.name}")
+        self._codes[key] = code
+        definitions.append(UNIT.pack(code, unit.factor, *unit.dim, len(name)) + name)
+        return code
+
+    def encode(self, quantities):
+        """把一组 Quantity(或 QuantityArray)编码为一帧 bytes"""
+        # 帧内按 id(单位) 记住编号，避免逐个数据构造键；帧结束即丢弃
+        # {id(单位): (单位, 编号)}，保留单位的引用以免 id 被复用
+        local = {}
+        definitions = []
+        values = array('d')
+        ids = array('H')
+        for q in quantities:
+            entry = local.get(id(q.unit))
+            if entry is None:
+                entry = local[id(q.unit)] = (q.unit, self._code(q.unit, definitions))
+            code = entry[1]
+            value = q.value
+            if getattr(value, "ndim", 0):
+                value = value.ravel().tolist()
+                values.extend(value)
+                ids.extend([code] * len(value))
+            else:
+                values.append(value)
+                ids.append(code)
+        return b"".join([FRAME.pack(MAGIC, FORMAT_VERSION, len(definitions), len(values)),
+                         *definitions, _little_endian(values).tobytes(), _little_endian(ids).tobytes()])
+
+
+class WireDecoder:
+    """解码 WireEncoder 产生的帧，帧必须按编码顺序解码"""
+    def __init__(self):
+        self._units = []
+
+    def _read_units(self, data, offset, count):
+        for _ in range(count):
+            code, factor, *rest = UNIT.unpack_from(data, offset)
+            offset += UNIT.size
+            size = rest[7]
+            dim = UnitSystem.intern_dimension(tuple(int(e) if e == int(e) else e for e in rest[:7]))
+            name = bytes(data[offset:offset + size]).decode("utf-8")
+            offset += size
+            if code != len(self._units):
+                raise ValueError(f"Unexpected unit id {code} in quantity stream")
+            self._units.append(_restore_unit(name, factor, dim))
+        return offset
+
+    def decode_columns(self, data):
+        """解码一帧，返回 (数值 array('d'), 单位编号 array('H'), 单位列表)"""
+        data = memoryview(data)
+        if len(data) < FRAME.size:
+            raise ValueError("Truncated quantity frame")
+        magic, version, new_units, count = FRAME.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not a quantity frame")
+        offset = self._read_units(data, FRAME.size, new_units)
+        end = offset + count * (8 + 2)
+        if len(data) < end:
+            raise ValueError("Truncated quantity frame")
+        values = array('d')
+        values.frombytes(data[offset:offset + count * 8])
+        ids = array('H')
+        ids.frombytes(data[offset + count * 8:end])
+        return _little_endian(values), _little_endian(ids), self._units
+
+    def decode(self, data):
+        """解码一帧，返回 Quantity 列表"""
+        values, ids, units = self.decode_columns(data)
+        try:
+            return [Quantity(v, units[i]) for v, i in zip(values, ids)]
+        except IndexError:
+            raise ValueError("Unknown unit id in quantity frame") from None
+
+
+def dumps(quantities):
+    """编码为独立的一帧(包含用到的全部单位定义)"""
+    return WireEncoder().encode(quantities)
+
+
+def loads(data):
+    """解码 dumps() 产生的帧"""
+    return WireDecoder().decode(data)
@@ -0,0 +1,53 @@
+"""
+单位符号解析的微基准: 旧的线性词头扫描 vs 预计算符号索引
+
+    python benchmarks/bench_lookup.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SI import UnitSystem
+
+SYMBOLS = ['m', 'kg', 's', 'N', 'Ohm', 'inch', 'kOhm', 'uF', 'ns', 'MeV', 'mmol', 'GHz', 'mkg']
+
+
+def linear_scan(unit_name):
+    """旧版 _basical_unit 的查找方式: 逐表查找，每次排序词头并递归"""
+    if unit_name == '1':
+        return 1.0, {'1': 1}
+    if unit_name in UnitSystem.BASE_UNITS:
+        return 1.0, {unit_name: 1}
+    if unit_name in UnitSystem.DERIVED_UNITS:
+        factor, base = UnitSystem.DERIVED_UNITS[unit_name]
+        return factor, base.copy()
+    if unit_name in UnitSystem.English_UNITS:
+        factor, base = UnitSystem.English_UNITS[unit_name]
+        return factor, base.copy()
+    for prefix, factor in sorted(UnitSystem.PREFIXES.items(), key=lambda x: -len(x[0])):
+        if unit_name.startswith(prefix):
+            f, base = linear_scan(unit_name[len(prefix):])
+            return factor * f, base
+    raise ValueError(f"Undefined unit: {unit_name}")
+
+
+def bench(func, number):
+    timer = timeit.Timer(lambda: [func(s) for s in SYMBOLS])
+    best = min(timer.repeat(repeat=5, number=number))
+    return best / (number * len(SYMBOLS)) * 1e9
+
+
+def main(number=20000):
+    for s in SYMBOLS:
+        assert linear_scan(s)[0] == UnitSystem.lookup(s)[0], s
+    before = bench(linear_scan, number)
+    after = bench(UnitSystem.lookup, number)
+    print(f"linear scan : {before:8.1f} ns/symbol")
+    print(f"symbol index: {after:8.1f} ns/symbol")
+    print(f"speedup     : {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
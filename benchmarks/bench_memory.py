@@ -0,0 +1,55 @@
+"""
+Quantity 的内存占用与运算分配的基准
+
+    python benchmarks/bench_memory.py [N]
+
+bytes/Quantity      : 保存 N 个 Quantity (共享同一单位) 的列表，每个元素占用的字节数
+blocks/op, bytes/op : 保留 N 次运算结果时，每次运算新增的内存块数和字节数
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SI import Quantity, Unit
+
+
+def measure(build, n):
+    """返回 build(n) 所保留对象的 (每个元素的内存块数, 每个元素的字节数)"""
+    gc.collect()
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    before = tracemalloc.take_snapshot()
+    kept = build(n)
+    after = tracemalloc.take_snapshot()
+    blocks = sys.getallocatedblocks() - blocks_before
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del kept
+    return blocks / n, size / n
+
+
+def main(n=100000):
+    m = Unit("m")
+    s = Unit("s")
+    a = Quantity(3.0, m)
+    b = Quantity(2.0, s)
+    values = [float(i) for i in range(n)]
+    cases = {
+        "Quantity(value, unit)": lambda n: [Quantity(v, m) for v in values],
+        "q + q": lambda n: [a + a for _ in range(n)],
+        "q * q": lambda n: [a * b for _ in range(n)],
+        "q / q": lambda n: [a / b for _ in range(n)],
+        "q.to('km')": lambda n: [a.to("km") for _ in range(n)],
+    }
+    print(f"{'case':24s} {'blocks/item':>12s} {'bytes/item':>12s}")
+    for name, build in cases.items():
+        build(100)   # 预热缓存
+        blocks, size = measure(build, n)
+        print(f"{name:24s} {blocks:12.2f} {size:12.1f}")
+
+
+if __name__ == "__main__":
+    main(*(int(x) for x in sys.argv[1:2]))
@@ -0,0 +1,68 @@
+"""
+多进程批量执行的扩展性基准: 1..N 个工作进程下的公式求值和混合单位换算
+
+    python benchmarks/bench_parallel.py                    # 默认 1..CPU 核数
+    python benchmarks/bench_parallel.py --workers 1 2 4 8 --size 4000000
+
+作为参照，同时给出逐个 Quantity 运算的耗时(按 --sample 个元素外推)。
+工作进程在有 numpy 时按块向量化计算，否则逐元素计算。
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SI import BatchExecutor, Quantity, compile_formula
+
+UNITS = ["mm", "cm", "inch", "km", "m", "foot"]
+
+
+def _best(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=list(range(1, (os.cpu_count() or 1) + 1)))
+    parser.add_argument("--size", type=int, default=2_000_000)
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sample", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    volts = array('d', (rng.uniform(1, 10) for _ in range(args.size)))
+    ohms = array('d', (rng.uniform(1, 100) for _ in range(args.size)))
+    units = [rng.choice(UNITS) for _ in range(args.size)]
+    P = compile_formula("V**2 / R", V="V", R="kOhm")
+
+    sample = range(min(args.sample, args.size))
+    per_item = _best(lambda: [Quantity(volts[i], "V") ** 2 / Quantity(ohms[i], "kOhm") for i in sample],
+                     args.repeat) / len(sample)
+    print(f"cpu_count={os.cpu_count()} size={args.size} chunk_size={args.chunk_size}")
+    print(f"Quantity loop (extrapolated) : {per_item * args.size:8.3f} s")
+
+    print(f"{'workers':>7} {'formula s':>10} {'speedup':>8} {'convert s':>10} {'speedup':>8}")
+    serial = None
+    for workers in args.workers:
+        with BatchExecutor(workers, args.chunk_size) as executor:
+            executor.evaluate(P, volts, ohms)   # 预热: 启动进程池，工作进程编译公式
+            formula = _best(lambda: executor.evaluate(P, volts, ohms), args.repeat)
+            convert = _best(lambda: executor.convert(volts, units, "m"), args.repeat)
+        if serial is None:
+            serial = (formula, convert)
+        print(f"{workers:7d} {formula:10.3f} {serial[0] / formula:8.2f} {convert:10.3f} {serial[1] / convert:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Quantity 序列化的体积和吞吐: pickle(逐个、整批)与 SI.wire 帧编码
+
+    python benchmarks/bench_wire.py
+    python benchmarks/bench_wire.py --size 100000 --units 3
+
+体积为每个数据的平均字节数，吞吐为每秒编码/解码的数据个数。
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SI import Quantity
+from SI.wire import WireDecoder, dumps, loads
+
+UNITS = ["km/h", "m/s", "mph", "kOhm", "uF", "J/(mol·K)"]
+
+
+def _best(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=50_000)
+    parser.add_argument("--units", type=int, default=3, help="number of distinct units")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    units = UNITS[:args.units]
+    quantities = [Quantity(i * 0.5, units[i % len(units)]) for i in range(args.size)]
+    single = [pickle.dumps(q, pickle.HIGHEST_PROTOCOL) for q in quantities]
+    batch = pickle.dumps(quantities, pickle.HIGHEST_PROTOCOL)
+    frame = dumps(quantities)
+
+    cases = [
+        ("pickle (each)", sum(map(len, single)),
+         lambda: [pickle.dumps(q, pickle.HIGHEST_PROTOCOL) for q in quantities],
+         lambda: [pickle.loads(b) for b in single]),
+        ("pickle (list)", len(batch),
+         lambda: pickle.dumps(quantities, pickle.HIGHEST_PROTOCOL),
+         lambda: pickle.loads(batch)),
+        ("wire", len(frame),
+         lambda: dumps(quantities),
+         lambda: loads(frame)),
+        ("wire (columns)", len(frame),
+         lambda: dumps(quantities),
+         lambda: WireDecoder().decode_columns(frame)),
+    ]
+    print(f"size={args.size} units={len(units)}")
+    print(f"{'format':<16} {'bytes/item':>10} {'encode/s':>12} {'decode/s':>12}")
+    for name, size, encode, decode in cases:
+        enc = _best(encode, args.repeat)
+        dec = _best(decode, args.repeat)
+        print(f"{name:<16} {size / args.size:10.2f} {args.size / enc:12,.0f} {args.size / dec:12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
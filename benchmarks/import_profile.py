@@ -0,0 +1,67 @@
+"""
+分析 import SI 的耗时分布 (基于 python -X importtime)
+
+    python benchmarks/import_profile.py [--top N] [--budget MS]
+
+打印 SI 各模块和最耗时的依赖模块，以及 import SI 的总耗时；
+超出 --budget (默认 IMPORT_BUDGET_MS) 时以非零状态退出。
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 启动耗时目标: 新进程中 import SI (不含解释器启动、已有字节码缓存) 的累计耗时上限
+# import SI 不应导入 numpy、re 等重量级模块，也不应解析任何单位
+IMPORT_BUDGET_MS = 10.0
+
+
+def python_env():
+    """允许写入字节码缓存，否则测到的主要是编译源码的时间"""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def import_times(module="SI"):
+    """返回 [(模块名, 自身耗时 us, 累计耗时 us)]，按导入完成顺序"""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         cwd=ROOT, capture_output=True, text=True, check=True, env=python_env())
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--top", type=int, default=10, help="显示最耗时的依赖模块个数")
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET_MS, help="耗时上限 (ms)")
+    parser.add_argument("--repeat", type=int, default=5, help="取多次运行中总耗时最小的一次")
+    args = parser.parse_args(argv)
+
+    import_times()   # 预热字节码缓存
+    runs = [import_times() for _ in range(args.repeat)]
+    rows = min(runs, key=lambda r: dict((n, c) for n, _, c in r).get("SI", 0))
+    total_ms = dict((n, c) for n, _, c in rows)["SI"] / 1000
+
+    print("SI modules (self / cumulative ms):")
+    for name, self_us, cumulative_us in rows:
+        if name == "SI" or name.startswith("SI."):
+            print(f"  {name:28s} {self_us / 1000:8.2f} {cumulative_us / 1000:8.2f}")
+    print("\nheaviest dependencies (self ms):")
+    others = sorted((r for r in rows if not r[0].startswith("SI")), key=lambda r: -r[1])
+    for name, self_us, _ in others[:args.top]:
+        print(f"  {name:28s} {self_us / 1000:8.2f}")
+    status = "OK" if total_ms <= args.budget else "OVER BUDGET"
+    print(f"\nimport SI: {total_ms:.2f} ms (budget {args.budget:.0f} ms) {status}")
+    return 0 if total_ms <= args.budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+SI.server 换算服务的负载测试: 延迟分位数和吞吐
+
+    python benchmarks/load_server.py                       # 在本进程中启动服务
+    python benchmarks/load_server.py --socket /tmp/si.sock # 测试已启动的服务(python -m SI.server /tmp/si.sock)
+    python benchmarks/load_server.py --clients 8 --concurrency 64 --window 0.002
+
+每个客户端一个连接，各自保持 concurrency 个未完成的请求；请求的单位组合从 --units 个中轮流选取。
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SI.server import DEFAULT_WINDOW, ConversionClient, ConversionServer
+
+PAIRS = [("km/h", "m/s"), ("inch", "mm"), ("kWh", "MJ"), ("mph", "km/h"),
+         ("J/(mol·K)", "J/(mol*K)"), ("uF*kOhm", "ms"), ("pound", "g"), ("atm", "kPa")]
+
+
+def _percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+async def _client(path, requests, concurrency, pairs, latencies):
+    async with ConversionClient(path) as client:
+        async def worker(start):
+            for i in range(start, requests, concurrency):
+                source, target = pairs[i % len(pairs)]
+                begin = time.perf_counter()
+                await client.convert(float(i), source, target)
+                latencies.append(time.perf_counter() - begin)
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+
+
+async def _run(args, path):
+    pairs = PAIRS[:args.units]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(path, args.requests, args.concurrency, pairs, latencies)
+                           for _ in range(args.clients)))
+    return latencies, time.perf_counter() - start
+
+
+async def _main(args):
+    if args.socket:
+        return await _run(args, args.socket), None
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "si.sock")
+        async with ConversionServer(path, window=args.window) as server:
+            return await _run(args, path), server.stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--socket", help="existing server socket; default starts one in-process")
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=5000, help="requests per client")
+    parser.add_argument("--concurrency", type=int, default=32, help="in-flight requests per client")
+    parser.add_argument("--units", type=int, default=4, help="number of distinct unit pairs")
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW, help="batch window of the in-process server")
+    args = parser.parse_args(argv)
+
+    (latencies, elapsed), stats = asyncio.run(_main(args))
+    latencies.sort()
+    print(f"clients={args.clients} requests={len(latencies)} concurrency={args.concurrency} units={args.units}")
+    print(f"throughput  {len(latencies) / elapsed:12,.0f} req/s")
+    for p in (50, 90, 99, 99.9):
+        print(f"p{p:<10} {_percentile(latencies, p) * 1e3:12.3f} ms")
+    print(f"max         {latencies[-1] * 1e3:12.3f} ms")
+    if stats:
+        print(f"batches={stats['batches']} mean batch={stats['requests'] / stats['batches']:.1f} "
+              f"resolved/request={stats['resolved'] / stats['requests']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+性能基准套件: 单位解析、兼容性检查与换算、Quantity 运算链、导出单位化简和导入耗时
+
+    python benchmarks/run.py                          # 运行并打印结果
+    python benchmarks/run.py --json out.json          # 另存为 JSON
+    python benchmarks/run.py --compare baseline.json  # 与基线对比
+    python benchmarks/run.py -k parse --quick         # 只运行名称含 parse 的用例
+
+每个用例取多次重复中的最小值(同时记录中位数)，单位为 ns/op。与基线对比时，慢于 --threshold
+(默认 10%) 的用例标记为 REGRESSION，加 --fail-on-regression 时以非零状态退出。
+"""
+import argparse
+import contextlib
+import json
+import os
+import pickle
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from SI import Constants, Quantity, Unit, compile_formula
+from SI.stats import Sum
+from SI import wire
+
+
+@contextlib.contextmanager
+def _parse_cache_disabled():
+    """关闭解析缓存，用于测量解析本身"""
+    size = Unit.cache_info().maxsize
+    Unit.set_cache_size(0)
+    try:
+        yield
+    finally:
+        Unit.set_cache_size(size)
+
+
+def _ohm_power():
+    V = 10 * Unit("V")
+    R = 50 * Unit("kOhm")
+    I = V / R
+    return I ** 2 * R
+
+
+def _light_in_water():
+    d = 1.30 * Unit("m")
+    return (d / Constants.c * 1.33).to("ns")
+
+
+def _cases():
+    """{用例名: 无参函数}"""
+    m, mm, s = Unit("m"), Unit("mm"), Unit("s")
+    compound = Unit("kg*m^2/(A^2*s^3)")
+    product = Unit("kg") * Unit("m^2") / Unit("s^2")
+    ohm_power = compile_formula("V**2 / R", V="V", R="kOhm")
+    mixed = [Quantity(i, ("mm", "inch", "km")[i % 3]) for i in range(1000)]
+    pickled = pickle.dumps(Quantity(36, "km/h"), pickle.HIGHEST_PROTOCOL)
+    frame = wire.dumps(mixed)
+    return {
+        # parse.* 在关闭解析缓存时测量，见 UNCACHED
+        "parse.simple": lambda: Unit("m"),
+        "parse.prefixed": lambda: Unit("kOhm"),
+        "parse.compound": lambda: Unit("kg*m^2/(A^2*s^3)"),
+        "parse.compound.nested": lambda: Unit("J/(mol·K)"),
+        "cached.parse.compound": lambda: Unit("kg*m^2/(A^2*s^3)"),
+        "unit.is_compatible": lambda: m.is_compatible(mm),
+        "unit.is_compatible.str": lambda: compound.is_compatible("Ohm"),
+        "unit.is_compatible.false": lambda: m.is_compatible(s),
+        "unit.convert_to": lambda: mm.convert_to(m),
+        "unit.convert_to.str": lambda: Unit("km/h").convert_to("m/s"),
+        "unit.to_derived_unit": lambda: product.to_derived_unit(),
+        "unit.to_derived_unit.uncached": lambda: product._derive(),
+        "quantity.ohm_power": _ohm_power,
+        "quantity.light_in_water": _light_in_water,
+        "quantity.to": lambda: Quantity(36, "km/h").to("m/s"),
+        "formula.ohm_power": lambda: ohm_power(10, 50),
+        "formula.ohm_power.kernel": lambda: ohm_power.kernel(10, 50),
+        # 1000 个混合单位数据求和
+        "quantity.sum.mixed": lambda: sum(mixed[1:], mixed[0]),
+        "stats.sum.mixed": lambda: Sum().update(mixed).result(),
+        "pickle.quantity.loads": lambda: pickle.loads(pickled),
+        "wire.encode.mixed": lambda: wire.dumps(mixed),
+        "wire.decode.mixed": lambda: wire.loads(frame),
+    }
+
+
+# 需要关闭解析缓存测量的用例前缀
+UNCACHED = ("parse.",)
+
+
+def measure(func, repeat=5, min_time=0.2):
+    """返回 func 单次调用耗时 (ns) 的 (最小值, 中位数, 每轮调用次数)"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    times = [t / number * 1e9 for t in timer.repeat(repeat=repeat, number=number)]
+    return min(times), statistics.median(times), number
+
+
+def measure_import(repeat=5):
+    """测量新进程中 import SI 的耗时 (ns)，扣除解释器启动时间"""
+    from import_profile import python_env
+
+    def run(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, env=python_env())
+        return time.perf_counter() - start
+    run("import SI")   # 预热字节码缓存
+    baseline = min(run("pass") for _ in range(repeat))
+    totals = [max(run("import SI") - baseline, 0.0) * 1e9 for _ in range(repeat)]
+    return min(totals), statistics.median(totals), 1
+
+
+def run_suite(pattern=None, repeat=5, min_time=0.2, with_import=True):
+    results = {}
+    for name, func in _cases().items():
+        if pattern and pattern not in name:
+            continue
+        with _parse_cache_disabled() if name.startswith(UNCACHED) else contextlib.nullcontext():
+            func()   # 预热其余缓存
+            results[name] = _result(*measure(func, repeat, min_time))
+    if with_import and (not pattern or pattern in "import.SI"):
+        results["import.SI"] = _result(*measure_import(repeat))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+        },
+        "results": results,
+    }
+
+
+def _result(best, median, number):
+    return {"ns_per_op": best, "median_ns": median,
+            "ops_per_sec": 1e9 / best if best else 0.0, "number": number}
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, threshold=0.10):
+    """返回 [(用例名, 基线 ns, 当前 ns, 比值, 是否退化)]"""
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or not base["ns_per_op"]:
+            continue
+        ratio = result["ns_per_op"] / base["ns_per_op"]
+        rows.append((name, base["ns_per_op"], result["ns_per_op"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def _format_ns(ns):
+    if ns >= 1e6:
+        return f"{ns / 1e6:10.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:10.2f} us"
+    return f"{ns:10.1f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-k", dest="pattern", help="只运行名称包含该字符串的用例")
+    parser.add_argument("--json", help="把结果写入 JSON 文件")
+    parser.add_argument("--compare", help="与基线 JSON 文件对比")
+    parser.add_argument("--threshold", type=float, default=0.10, help="判定退化的相对阈值")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--quick", action="store_true", help="减少重复次数")
+    parser.add_argument("--no-import", action="store_true", help="跳过导入耗时测量")
+    args = parser.parse_args(argv)
+
+    repeat, min_time = (3, 0.05) if args.quick else (5, 0.2)
+    current = run_suite(args.pattern, repeat, min_time, not args.no_import)
+    for name, result in current["results"].items():
+        print(f"{name:32s} {_format_ns(result['ns_per_op'])}  (median {_format_ns(result['median_ns']).strip()})")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(current, baseline, args.threshold)
+        print(f"\ncompared with {args.compare} (commit {baseline['meta'].get('commit')})")
+        for name, base, now, ratio, regressed in rows:
+            flag = "REGRESSION" if regressed else ""
+            print(f"{name:32s} {_format_ns(base)} -> {_format_ns(now)}  x{ratio:5.2f} {flag}")
+        if args.fail_on_regression and any(row[4] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
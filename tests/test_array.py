@@ -0,0 +1,51 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from SI import Constants, Quantity, QuantityArray, Unit
+
+
+def test_arithmetic_matches_scalar_quantities():
+    d = QuantityArray([1.30, 2.60], "m")
+    t = (d / Constants.c * 1.33).to("ns")
+    expected = (1.30 * Unit("m") / Constants.c * 1.33).to("ns")
+    assert t.unit.name == "ns"
+    assert t.value[0] == expected.value
+
+    V = QuantityArray([10, 20], "V")
+    P = (V / (50 * Unit("kOhm"))) ** 2 * (50 * Unit("kOhm"))
+    assert P.unit.name == "W"
+    assert np.allclose(P.value, [2e-3, 8e-3])
+
+
+def test_mixed_operands_and_comparisons():
+    a = QuantityArray([1.0, 2.0], "m")
+    assert (a + 50 * Unit("cm")).unit.name == "m"
+    assert (50 * Unit("cm") + a).unit.name == "cm"
+    assert isinstance(np.array([1.0, 2.0]) * Unit("mm"), QuantityArray)
+    assert list(a > Quantity(1500, "mm")) == [False, True]
+    with pytest.raises(ValueError):
+        a + 1 * Unit("s")
+
+
+def test_reductions_and_slicing():
+    a = QuantityArray([1.0, 2.0, 3.0], "km")
+    assert a.sum().value == 6.0 and a.sum().unit.name == "km"
+    assert a.mean().value == 2.0
+    assert a.min().value == 1.0 and a.max().value == 3.0
+    assert isinstance(a[0], Quantity) and a[0].value == 1.0
+    assert isinstance(a[1:], QuantityArray) and len(a[1:]) == 2
+    assert QuantityArray.from_quantities([1 * Unit("inch"), 1 * Unit("foot")], "cm").value.tolist() == [2.54, 30.48]
+
+
+def test_spectral_conversions_are_vectorized():
+    wavelengths = QuantityArray(np.linspace(200, 800, 7), "nm")
+    E = wavelengths.toeV()
+    assert isinstance(E, QuantityArray) and E.unit.name == "eV"
+    expected = [Quantity(x, "nm").toeV().value for x in wavelengths.value]
+    assert np.allclose(E.value, expected, rtol=1e-15)
+    assert np.allclose(E.tonm().value, wavelengths.value, rtol=1e-12)
+    assert np.allclose(QuantityArray([1, 2], "keV").toeV().value, [1000, 2000])
+    p = QuantityArray([1e-20, 2e-20], "kg*m/s").toMeV()
+    assert p.unit.name == "MeV"
+    assert np.allclose(p.value, [Quantity(x, "kg*m/s").toMeV().value for x in (1e-20, 2e-20)], rtol=1e-15)
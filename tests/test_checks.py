@@ -0,0 +1,94 @@
+import pytest
+
+from SI import Quantity, Unit, checked
+from SI import checks
+
+
+@checked(d="m", t="s", returns="m/s")
+def speed(d, t):
+    return d / t
+
+
+def test_arguments_are_converted_to_declared_units():
+    seen = []
+
+    @checked(d="m", t="s")
+    def record(d, t=None):
+        seen.append((d, t))
+
+    record(Quantity(3, "km"), t=Quantity(2, "min"))
+    record(Quantity(5, "m"))
+    assert seen[0][0].unit.name == "m" and seen[0][0].value == 3000
+    assert seen[0][1].unit.name == "s" and seen[0][1].value == 120
+    q = Quantity(5, "m")
+    record(q)
+    assert seen[-1][0] is q and seen[-1][1] is None     # 同单位原样传入，缺省参数不检查
+
+
+def test_return_value_is_converted():
+    v = speed(Quantity(3, "km"), Quantity(2, "min"))
+    assert v.unit.name == "m/s" and v.value == 25.0
+    assert speed(Quantity(36, "km"), Quantity(1, "h")).value == 10.0
+
+
+def test_mismatched_dimensions_raise():
+    with pytest.raises(ValueError, match="Argument d of speed"):
+        speed(Quantity(3, "s"), Quantity(2, "s"))
+    with pytest.raises(ValueError, match="plain number"):
+        speed(3, Quantity(2, "s"))
+
+    @checked(x="m", returns="s")
+    def wrong(x):
+        return x
+    with pytest.raises(ValueError, match="Result of wrong"):
+        wrong(Quantity(1, "m"))
+    with pytest.raises(TypeError):
+        checked(y="m")(lambda x: x)
+
+
+def test_each_signature_checked_once(monkeypatch):
+    calls = []
+    original = checks._factor
+
+    def counting(*args):
+        calls.append(args[0])
+        return original(*args)
+    monkeypatch.setattr(checks, "_factor", counting)
+
+    @checked(a="m", returns="m")
+    def ident(a):
+        return a
+
+    @checked(a="m", returns="m", strict=True)
+    def strict_ident(a):
+        return a
+
+    for _ in range(5):
+        ident(Quantity(1, "km"))
+        strict_ident(Quantity(1, "km"))
+    assert calls.count("Argument a of ident()") == 1
+    assert calls.count("Argument a of strict_ident()") == 5
+    assert ident(Quantity(1, "mm")).value == pytest.approx(1e-3)
+    assert calls.count("Argument a of ident()") == 2
+
+
+def test_quantity_arrays_pass_through():
+    np = pytest.importorskip("numpy")
+    from SI import QuantityArray
+    v = speed(QuantityArray([1, 2], "km"), Quantity(1, "s"))
+    assert isinstance(v, QuantityArray) and np.allclose(v.value, [1000, 2000])
+    assert v.unit == Unit("m/s")
+
+
+def test_signature_cache_is_bounded():
+    @checked(d="m")
+    def length(d):
+        return d
+
+    # 每次新建的相等单位共用一个条目
+    for _ in range(10):
+        length(Quantity(1, Unit("km", 1000.0, {"m": 1})))
+    assert len(length.checker.plans) == 1
+    for i in range(1, checks._PLAN_CACHE_SIZE + 10):
+        length(Quantity(1, Unit("m", float(i), {"m": 1})))
+    assert len(length.checker.plans) <= checks._PLAN_CACHE_SIZE
@@ -0,0 +1,34 @@
+import io
+
+import pytest
+
+from SI import Quantity, convert_csv, convert_stream
+
+
+def test_convert_stream_mixed_units():
+    rows = [(1, "mm"), (2, "cm"), ("1", "inch"), Quantity(1, "foot")]
+    assert [round(v, 6) for v in convert_stream(rows, "mm")] == [1.0, 20.0, 25.4, 304.8]
+
+
+def test_convert_stream_chunks():
+    rows = ((i, "km") for i in range(5))
+    assert list(convert_stream(rows, "m", chunk_size=2)) == [[0.0, 1000.0], [2000.0, 3000.0], [4000.0]]
+
+
+def test_convert_stream_incompatible_unit():
+    with pytest.raises(ValueError):
+        list(convert_stream([(1, "m"), (1, "s")], "m"))
+
+
+def test_convert_csv_by_column_name():
+    data = io.StringIO("id,length,unit\n1,3,mm\n2,2,cm\n3,1,m\n")
+    values = convert_csv(data, "cm", value_column="length", unit_column="unit")
+    assert [round(v, 9) for v in values] == [0.3, 2.0, 100.0]
+
+
+def test_convert_csv_arrays():
+    np = pytest.importorskip("numpy")
+    data = io.StringIO("1;km\n2;km\n3;m\n")
+    chunks = list(convert_csv(data, "m", chunk_size=2, as_array=True, delimiter=";"))
+    assert isinstance(chunks[0], np.ndarray)
+    assert [c.tolist() for c in chunks] == [[1000.0, 2000.0], [3.0]]
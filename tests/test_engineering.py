@@ -0,0 +1,50 @@
+import math
+
+import pytest
+
+from SI import Quantity, Unit, UnitSystem
+
+
+def _eng(value, unit):
+    q = Quantity(value, unit).to_engineering()
+    return q.value, q.unit.name
+
+
+def test_prefix_selection():
+    assert _eng(0.00005, "A") == (50.0, "uA")
+    assert _eng(15000, "Ohm") == (15.0, "kOhm")
+    assert _eng(0.5, "keV") == (500.0, "eV")
+    assert _eng(1500, "kg") == (1.5, "Mg")
+    assert _eng(0.02, "cm") == (200.0, "um")
+    assert _eng(5e-3, "N*m") == (5.0, "mJ")
+    assert _eng(0, "V") == (0, "V")
+    assert _eng(-2e-9, "F") == (-2.0, "nF")
+    assert _eng(1e30, "m") == (1e6, "Ym")     # 超出词头范围时取最大的词头
+
+
+def test_units_without_prefixes():
+    assert _eng(2, "h") == (2, "h")
+    assert _eng(3, "mile") == (3, "mile")
+    assert _eng(3, "km/h") == (3, "km/h")     # 该量纲没有命名单位
+    assert _eng(0.5, "1") == (0.5, "1")
+
+
+def test_preferred_unit():
+    UnitSystem.set_preferred_unit("eV")
+    try:
+        value, name = _eng(3e-16, "J")
+        assert name == "keV" and math.isclose(value, 3e-16 / 1.602176634e-16)
+    finally:
+        UnitSystem.set_preferred_unit("eV", False)
+    assert _eng(3e-16, "J") == (300.0, "aJ")
+
+
+def test_array_variant_matches_scalar():
+    np = pytest.importorskip("numpy")
+    from SI import QuantityArray
+    values = [5e-5, 1.5e4, 0.0, -2e-9, 3.3, 999.0, 1e-30]
+    result = QuantityArray(values, "Ohm").to_engineering()
+    expected = [Quantity(v, "Ohm").to_engineering() for v in values]
+    assert [(q.value, q.unit.name) for q in result] == [(q.value, q.unit.name) for q in expected]
+    assert result[0].unit is Unit("uOhm")
+    assert np.isnan(QuantityArray([np.nan], "A").to_engineering()[0].value)
@@ -0,0 +1,47 @@
+import math
+
+import pytest
+
+from SI import Constants, Quantity, Unit, compile_formula
+
+
+def test_formula_string_matches_quantity_path():
+    P = compile_formula("V**2 / R", V="V", R="kOhm")
+    assert P.unit == Unit("W")
+    assert math.isclose(P(V=10, R=50).value, 0.002)
+    assert math.isclose(P.kernel(10, 50), 0.002)
+
+
+def test_formula_callable_with_constant_and_returns():
+    t = compile_formula(lambda d, n: d / Constants.c * n, d="m", n="1", returns="ns")
+    expected = (1.30 * Unit("m") / Constants.c * 1.33).to("ns").value
+    assert math.isclose(t(1.30, 1.33).value, expected)
+    assert math.isclose(t(Quantity(130, "cm"), 1.33).value, expected)
+
+
+def test_formula_addition_aligns_units():
+    f = compile_formula("x + y", x="m", y="mm")
+    assert math.isclose(f(1, 5).value, 1.005)
+    with pytest.raises(ValueError):
+        compile_formula("x + y", x="m", y="s")
+
+
+def test_formula_returns_checked():
+    with pytest.raises(ValueError):
+        compile_formula("x * y", x="m", y="s", returns="J")
+
+
+def test_formula_arguments():
+    f = compile_formula("0.5 * m * v**2", m="g", v="km/h")
+    assert math.isclose(f(1000, 36).value, 50.0)
+    with pytest.raises(TypeError):
+        f(1000)
+
+
+def test_formula_arrays():
+    np = pytest.importorskip("numpy")
+    from SI import QuantityArray
+    P = compile_formula("V**2 / R", V="V", R="Ohm", returns="mW")
+    result = P(np.array([1.0, 2.0]), 1000)
+    assert isinstance(result, QuantityArray)
+    assert np.allclose(result.value, [1.0, 4.0])
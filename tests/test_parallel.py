@@ -0,0 +1,44 @@
+import math
+
+import pytest
+
+from SI import BatchExecutor, compile_formula, convert_batch, evaluate_batch
+
+
+VALUES = [float(i) for i in range(1, 201)]
+UNITS = ["mm", "cm", "inch", "km"] * 50
+
+
+def _expected_lengths():
+    factors = {"mm": 1e-3, "cm": 1e-2, "inch": 0.0254, "km": 1e3}
+    return [v * factors[u] for v, u in zip(VALUES, UNITS)]
+
+
+def test_convert_batch_serial():
+    assert list(convert_batch([1, 2], "km", "m", workers=1)) == [1000.0, 2000.0]
+    result = convert_batch(VALUES, UNITS, "m", workers=1)
+    assert all(math.isclose(a, b) for a, b in zip(result, _expected_lengths()))
+
+
+def test_evaluate_batch_serial():
+    P = compile_formula("V**2 / R", V="V", R="kOhm")
+    result = evaluate_batch(P, [10, 20], [50, 100], workers=1)
+    assert [round(v, 12) for v in result] == [0.002, 0.004]
+    with pytest.raises(ValueError):
+        evaluate_batch(P, [1, 2], [1], workers=1)
+
+
+def test_process_pool_matches_serial():
+    P = compile_formula("V**2 / R", V="V", R="kOhm")
+    with BatchExecutor(workers=2, chunk_size=32) as executor:
+        converted = executor.convert(VALUES, UNITS, "m")
+        evaluated = executor.evaluate(P, R=VALUES, V=VALUES)
+    assert all(math.isclose(a, b) for a, b in zip(converted, _expected_lengths()))
+    assert list(evaluated) == list(evaluate_batch(P, VALUES, VALUES, workers=1))
+
+
+def test_callable_formula_falls_back_to_serial():
+    P = compile_formula(lambda V, R: V ** 2 / R, V="V", R="Ohm")
+    with BatchExecutor(workers=2, chunk_size=10) as ex:
+        assert list(ex.evaluate(P, [1.0] * 100, [2.0] * 100)) == [0.5] * 100
+        assert ex._pool is None    # 由函数编译的公式不会启动进程池
@@ -0,0 +1,106 @@
+"""新的单遍解析器与原 RPN 解析器的差分测试"""
+import math
+import random
+import re
+
+import pytest
+
+from SI import Unit
+
+
+def legacy_parse_expr(expr):
+    """原 Unit.parse_expr 的副本(逆波兰 + 逐步构造 Unit)，仅用于对照"""
+    def to_rpn(expr):
+        expr = expr.replace(' ', '')
+        tokens = re.findall(r'[A-Za-zμ1]+(?:\^\-?\d+)?|\d+|[·*/()]', expr)
+        output = []
+        stack = []
+        precedence = {'*': 1, '·': 1, '/': 1}
+        for token in tokens:
+            if re.match(r'[A-Za-zμ1]+(?:\^\-?\d+)?', token):
+                output.append(token)
+            elif token in ('*', '·', '/'):
+                while stack and stack[-1] != '(' and precedence.get(stack[-1], 0) >= precedence[token]:
+                    output.append(stack.pop())
+                stack.append(token)
+            elif token == '(':
+                stack.append(token)
+            elif token == ')':
+                while stack and stack[-1] != '(':
+                    output.append(stack.pop())
+                stack.pop()
+        while stack:
+            output.append(stack.pop())
+        return output
+
+    stack = []
+    for token in to_rpn(expr):
+        if re.match(r'[A-Za-zμ1]+(?:\^\-?\d+)?', token):
+            if '^' in token:
+                base, exp = token.split('^')
+                stack.append(Unit(base) ** int(exp))
+            else:
+                stack.append(Unit(token))
+        elif token in ('*', '·'):
+            b = stack.pop()
+            a = stack.pop()
+            stack.append(a * b)
+        elif token == '/':
+            b = stack.pop()
+            a = stack.pop()
+            stack.append(a / b)
+    assert len(stack) == 1
+    return stack[0]
+
+
+SYMBOLS = ['m', 'kg', 's', 'A', 'K', 'mol', 'cd', 'N', 'J', 'W', 'Pa', 'Ohm', 'V', 'Hz', 'eV', 'g',
+           'h', 'min', 'km', 'mm', 'ns', 'uF', 'kOhm', 'MeV', 'inch', 'foot', 'mile', 'pound', 'cm']
+
+
+def _factor(rng, depth):
+    if depth < 3 and rng.random() < 0.2:
+        return f"({_expr(rng, depth + 1)})"
+    symbol = rng.choice(SYMBOLS)
+    if rng.random() < 0.3:
+        symbol += f"^{rng.choice([-3, -2, -1, 2, 3])}"
+    return symbol
+
+
+def _expr(rng, depth=0):
+    parts = ["1/"] if depth == 0 and rng.random() < 0.1 else []
+    parts.append(_factor(rng, depth))
+    for _ in range(rng.randint(0, 3)):
+        parts.append(rng.choice(["*", "/", "·", " * ", " / "]))
+        parts.append(_factor(rng, depth))
+    return "".join(parts)
+
+
+def corpus(size=5000, seed=20240501):
+    rng = random.Random(seed)
+    return [_expr(rng) for _ in range(size)]
+
+
+def test_matches_legacy_parser():
+    for expr in corpus():
+        new = Unit.parse_expr(expr)
+        old = legacy_parse_expr(expr)
+        assert new.dim == old.dim, expr
+        assert new.name == old.name, expr
+        assert math.isclose(new.factor, old.factor, rel_tol=1e-12), expr
+
+
+@pytest.mark.parametrize("expr, expected", [
+    ("(m/s)^2", "m^2/s^2"),
+    ("1/(s*(kg/A)^2)", "A^2/(kg^2*s)"),
+    ("m/(s*(kg/A)^2)^-1", "kg^2*m*s/A^2"),
+    ("J/(mol·K)", "J/(K*mol)"),
+    ("s^-2", "1/s^2"),
+])
+def test_group_exponents_and_nesting(expr, expected):
+    assert Unit.parse_expr(expr).name == expected
+
+
+@pytest.mark.parametrize("expr", ["m*", "*m", "m)", "(m", "m(s)", "m2/s", "m/$", "()"])
+def test_malformed_expressions(expr):
+    with pytest.raises(ValueError):
+        Unit.parse_expr(expr)
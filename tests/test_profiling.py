@@ -0,0 +1,40 @@
+import io
+import json
+
+from SI import Quantity, Unit, profiling
+
+
+def test_profiling_off_by_default():
+    assert not profiling.is_enabled()
+    assert not hasattr(Unit.__dict__["parse_expr"].__func__, "__wrapped__")
+
+
+def test_scoped_profile_counts_calls_and_units():
+    original = Unit.__dict__["is_compatible"]
+    with profiling.profile() as p:
+        Unit("km/h").convert_to("m/s")
+        Unit("km/h")
+        Quantity(1, "m").to("mm")
+    assert Unit.__dict__["is_compatible"] is original
+    stats = p.stats
+    assert stats["enabled"] is False
+    assert stats["functions"]["Unit()"]["calls"] >= 3
+    assert stats["functions"]["Quantity.__init__"]["calls"] >= 2
+    assert dict(stats["top_units"])["km/h"] == 2
+    assert stats["caches"]["parse"]["hits"] >= 1
+
+
+def test_snapshot_and_dump():
+    profiling.enable()
+    try:
+        profiling.reset()
+        Unit("kg*m^2/s^2").to_derived_unit()
+        out = io.StringIO()
+        profiling.dump(out)
+        stats = json.loads(out.getvalue())
+        assert stats["enabled"] is True
+        assert dict(stats["top_units"])["kg*m^2/s^2"] == 1
+        assert "Unit.to_derived_unit" in profiling.snapshot()["functions"]
+    finally:
+        profiling.disable()
+    assert not profiling.is_enabled()
@@ -0,0 +1,76 @@
+import io
+import math
+import pickle
+
+import pytest
+
+from SI import Quantity, Unit
+
+
+def _power_chain():
+    V = 10 * Unit("V")
+    R = 50 * Unit("kOhm")
+    I = V / R
+    return I ** 2 * R
+
+
+def test_products_are_simplified_like_to_derived_unit():
+    assert str(_power_chain()) == "0.002 W"
+    import random
+    rng = random.Random(6)
+    units = ["V", "kOhm", "mA", "s", "km", "h", "uF", "J", "g"]
+    for _ in range(500):
+        a, b = (Quantity(rng.uniform(0.1, 1e3), rng.choice(units)) for _ in range(2))
+        # 与先构造乘积再化简逐位相同
+        for result, raw in ((a * b, Quantity(a.value * b.value, a.unit * b.unit)),
+                            (a / b, Quantity(a.value / b.value, a.unit / b.unit))):
+            expected = raw.to_derived_unit()
+            assert result.value == expected.value and result.unit is expected.unit
+
+
+def test_quantities_are_immutable_and_hashable():
+    q = Quantity(1, "m")
+    with pytest.raises(AttributeError):
+        q.value = 2
+    assert q == Quantity(1000, "mm")
+    assert hash(q) == hash(Quantity(1000, "mm"))
+    assert q != Quantity(1, "s")
+    assert len({q, Quantity(1000, "mm"), Quantity(2, "m")}) == 2
+    assert pickle.loads(pickle.dumps(q)) == q
+
+
+def test_spectral_conversions():
+    E = Quantity(500, "nm").toeV()
+    assert E.unit.name == "eV" and math.isclose(E.value, 2.479683968, rel_tol=1e-9)
+    assert math.isclose(E.tonm().value, 500, rel_tol=1e-12)
+    assert Quantity(2, "keV").toeV() == Quantity(2000, "eV")        # 能量输入返回 eV 而不是 nm
+    assert Quantity(5, "mm").tonm().value == 5e6
+    assert math.isclose(Quantity(1, "g").toMeV().value, 1e-3 * 299792458 ** 2 / 1.602176634e-13, rel_tol=1e-12)
+    assert Quantity(1, "GeV").toMeV().value == 1000
+    with pytest.raises(ValueError):
+        Quantity(1, "s").toeV()
+
+
+def test_parse():
+    q = Quantity.parse(" 3.2 km/h ")
+    assert q.value == 3.2 and q.unit is Unit("km/h")
+    assert Quantity.parse("1e-9 s") == Quantity(1, "ns")
+    assert Quantity.parse("-2.5e3J/(mol·K)").value == -2500
+    assert Quantity.parse("7").unit.name == "1"
+    for bad in ["", "km", "3 xyz", "3 m/", "5 m s"]:
+        with pytest.raises(ValueError):
+            Quantity.parse(bad)
+
+
+def test_parse_many_and_format_many_round_trip(tmp_path):
+    text = "50 kOhm\n\n1e-9 s\n3.25 km/h\n0.5\n"
+    parsed = list(Quantity.parse_many(io.StringIO(text)))
+    assert [str(q) for q in parsed] == ["50.0 kOhm", "0.0 s", "3.25 km/h", "0.5"]
+    out = io.StringIO()
+    assert Quantity.format_many(parsed, out, precision=12) == 4
+    assert out.getvalue() == "50.0 kOhm\n1e-09 s\n3.25 km/h\n0.5\n"
+    path = tmp_path / "q.txt"
+    path.write_text(out.getvalue(), encoding="utf-8")
+    assert list(Quantity.parse_many(str(path))) == parsed
+    with pytest.raises(ValueError, match="line 2"):
+        list(Quantity.parse_many(["1 m", "oops"]))
@@ -0,0 +1,82 @@
+import math
+import os
+
+import pytest
+
+from SI import Unit, UnitSystem, registry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    saved = UnitSystem._snapshot
+    derived = dict(UnitSystem.DERIVED_UNITS)
+    path = str(tmp_path / "registry.bin")
+    registry.build(path)
+    UnitSystem.invalidate()
+    Unit.cache_clear()
+    yield registry.load(path)
+    registry.unload()
+    UnitSystem.DERIVED_UNITS.clear()
+    UnitSystem.DERIVED_UNITS.update(derived)
+    UnitSystem._snapshot = saved
+    UnitSystem.invalidate()
+    Unit.cache_clear()
+
+
+def test_snapshot_matches_parser(snapshot):
+    assert len(snapshot) > 700
+    for expr in ["kOhm", "uF", "Ymile", "1", "min", "km/h", "kg*m^2/(A^2*s^3)", "J/(mol·K)"]:
+        cached = snapshot.unit(expr)
+        parsed = Unit.parse_expr(expr) if "/" in expr or "*" in expr else Unit._basical_unit(expr)
+        assert (cached.name, cached.dim) == (parsed.name, parsed.dim)
+        assert type(cached.factor) is type(parsed.factor)
+        assert math.isclose(cached.factor, parsed.factor, rel_tol=1e-15)
+    assert snapshot.unit("m/(s*kg)") is None
+
+
+def test_lookups_use_snapshot_then_fall_back(snapshot):
+    assert UnitSystem.lookup("kOhm")[0] == 1000.0
+    assert UnitSystem._registry.symbols is None
+    assert Unit("J/(mol·K)").name == "J/(K*mol)"
+    # 嵌套词头不在快照中，回退到完整索引
+    assert UnitSystem.lookup("kkm")[0] == 1e6
+    assert UnitSystem._registry.symbols is not None
+
+
+def test_snapshot_disabled_after_table_change(snapshot):
+    UnitSystem.lookup("kOhm")
+    UnitSystem.define_unit("bar", 1e5, {"kg": 1, "m": -1, "s": -2})
+    assert not snapshot.active and UnitSystem.snapshot() is None
+    assert UnitSystem.lookup("kbar")[0] == 1e8
+
+
+def test_stale_snapshot_ignored(tmp_path):
+    path = str(tmp_path / "registry.bin")
+    registry.build(path)
+    UnitSystem.DERIVED_UNITS["bar"] = (1e5, {"kg": 1, "m": -1, "s": -2})
+    saved = UnitSystem._snapshot
+    try:
+        with pytest.warns(UserWarning):
+            assert registry.load(path) is None
+    finally:
+        del UnitSystem.DERIVED_UNITS["bar"]
+        UnitSystem._snapshot = saved
+        UnitSystem.invalidate()
+
+
+def test_default_snapshot_is_built_on_first_use(tmp_path):
+    import subprocess
+    import sys
+    path = str(tmp_path / "registry.bin")
+    code = (
+        "import os\n"
+        "from SI import Unit, UnitSystem, registry\n"
+        f"registry.DEFAULT_PATH = {path!r}\n"
+        "Unit('kOhm')\n"
+        "print(os.path.exists(registry.DEFAULT_PATH), UnitSystem.snapshot() is not None)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=str(tmp_path), env={**os.environ, "PYTHONPATH": ROOT})
+    assert out.stdout.split() == ["True", "True"]
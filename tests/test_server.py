@@ -0,0 +1,81 @@
+import asyncio
+import json
+import sys
+
+import pytest
+
+from SI import Quantity, Unit
+from SI.server import ConversionClient, ConversionServer
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets")
+
+
+def _serve(tmp_path, scenario, **options):
+    async def run():
+        async with ConversionServer(str(tmp_path / "si.sock"), **options) as server:
+            async with ConversionClient(server.path) as client:
+                return server, await scenario(client)
+    return asyncio.run(run())
+
+
+def test_convert_and_to_derived(tmp_path):
+    async def scenario(client):
+        return await asyncio.gather(client.convert(36, "km/h", "m/s"),
+                                    client.convert([1, 2], "inch", "mm"),
+                                    client.to_derived(2, "N*m"))
+    _, (speed, lengths, derived) = _serve(tmp_path, scenario)
+    assert speed == pytest.approx(Quantity(36, "km/h").to("m/s").value)
+    assert lengths == pytest.approx([25.4, 50.8])
+    value, name = derived
+    assert (value, Unit(name)) == (pytest.approx(2.0), Unit("J"))
+
+
+def test_errors_are_raised_per_request(tmp_path):
+    async def scenario(client):
+        return await asyncio.gather(client.convert(1, "m", "s"),
+                                    client.convert(1, "nosuchunit", "m"),
+                                    client.convert(1, "m", "cm"),
+                                    return_exceptions=True)
+    _, (mismatch, unknown, ok) = _serve(tmp_path, scenario)
+    assert isinstance(mismatch, ValueError) and isinstance(unknown, ValueError)
+    assert ok == pytest.approx(100)
+
+
+def test_concurrent_requests_are_coalesced(tmp_path):
+    async def scenario(client):
+        async with ConversionClient(client.path) as other:
+            requests = [c.convert(i, unit, "m") for i in range(200)
+                        for c, unit in ((client, "km"), (other, "inch"))]
+            return await asyncio.gather(*requests)
+    server, results = _serve(tmp_path, scenario, window=0.05)
+    assert results[:4] == pytest.approx([0, 0, 1000, 0.0254])
+    assert server.stats["requests"] == 400
+    # 一个窗口内相同的单位组合只计算一次
+    assert server.stats["resolved"] <= 2 * server.stats["batches"] < 400
+
+
+def test_malformed_requests_do_not_stall_the_batch(tmp_path):
+    async def scenario(client):
+        reader, writer = await asyncio.open_unix_connection(client.path)
+        for request in ([1, "to", 1, ["m"], "cm"], [2, "to", 1, 5, "cm"], [3, "to", "x", "m", "cm"],
+                        [4, "nope", 1, "m"], [5, "derived", 1, "m", "s"], [[6], "to", 1, "m", "cm"]):
+            writer.write(json.dumps(request).encode() + b"\n")
+        writer.write(b"not json\n")
+        good = await client.convert(36, "km/h", "m/s")
+        replies = [json.loads(await reader.readline()) for _ in range(7)]
+        writer.close()
+        return good, replies
+    _, (good, replies) = _serve(tmp_path, scenario, window=0.05)
+    assert good == pytest.approx(10)
+    assert [r[0] for r in replies] == [1, 2, 3, 4, 5, None, None]
+    assert all(r[1] is None and isinstance(r[2], str) for r in replies)
+
+
+def test_load_script_runs_all_unit_pairs():
+    import os
+    import subprocess
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, os.path.join(root, "benchmarks", "load_server.py"),
+                          "--units", "8", "--clients", "2", "--requests", "200", "--concurrency", "8"],
+                         capture_output=True, text=True, check=True).stdout
+    assert "units=8" in out and "p99" in out
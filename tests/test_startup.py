@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code):
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return out.stdout.strip()
+
+
+def test_import_is_lazy():
+    code = (
+        "import sys, SI\n"
+        "print(sorted(m for m in ('numpy', 're', 'csv', 'multiprocessing') if m in sys.modules))\n"
+        "print(SI.UnitSystem._registry.symbols is None, type(vars(SI.Constants)['c']).__name__)\n"
+    )
+    assert _run(code).splitlines() == ["[]", "True _Constant"]
+
+
+def test_constants_materialize_once():
+    code = (
+        "from SI import Constants, Quantity\n"
+        "c = Constants.c\n"
+        "print(isinstance(vars(Constants)['c'], Quantity), Constants.c is c, c)\n"
+    )
+    assert _run(code) == "True True 299792458 m/s"
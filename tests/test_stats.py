@@ -0,0 +1,79 @@
+import math
+
+import pytest
+
+from SI import Quantity
+from SI.stats import Histogram, Max, Mean, Min, Sum, Variance
+
+DATA = [Quantity(3, "mm"), Quantity(1, "inch"), (0.002, "km"), Quantity(10, "cm")]
+METERS = [0.003, 0.0254, 2.0, 0.1]
+
+
+def test_sum_and_mean_mixed_units():
+    s = Sum().update(DATA)
+    assert s.unit.name == "mm" and s.count == 4
+    assert math.isclose(s.result().value, sum(METERS) * 1000)
+    assert math.isclose(Mean("m").update(DATA).result().value, sum(METERS) / 4)
+    assert math.isclose(Mean().update(DATA).result("km").value, sum(METERS) / 4000)
+
+
+def test_factor_cache_is_keyed_by_unit_value():
+    # 每行新建的单位字符串不会让缓存随数据量增长
+    s = Sum().update((float(v), u) for v, u in (f"{i} mm".split() for i in range(1000)))
+    s.update([Quantity(1, "mm"), Quantity(1, "m")])
+    assert s.count == 1002 and len(s._factors) == 3
+    assert math.isclose(s.result().value, 999 * 1000 / 2 + 1 + 1000)
+
+
+def test_variance_and_extrema():
+    v = Variance(ddof=1).update(DATA)
+    mean = sum(METERS) / 4
+    expected = sum((x - mean) ** 2 for x in METERS) / 3
+    assert math.isclose(v.result("m").value, expected)
+    assert v.result("m").unit.name == "m^2"
+    assert math.isclose(v.std("m").value, math.sqrt(expected))
+    assert Min().update(DATA).result("m").value == 0.003
+    assert math.isclose(Max().update(DATA).result().value, 2000.0)
+
+
+def test_incompatible_and_empty():
+    with pytest.raises(ValueError):
+        Sum("m").add(Quantity(1, "s"))
+    with pytest.raises(ValueError):
+        Mean("m").result()
+    assert Sum("m").result().value == 0.0
+
+
+def test_histogram():
+    h = Histogram([0, 1, 10, 100], "cm").update(DATA)
+    assert h.result() == [1, 1, 1] and h.overflow == 1 and h.underflow == 0
+    assert h.edges[1] == Quantity(1, "cm")
+
+
+def test_arrays_match_scalar_path():
+    np = pytest.importorskip("numpy")
+    from SI import QuantityArray
+    values = np.linspace(0, 5, 101)
+    for acc in (Sum, Mean, Min, Max, lambda: Variance(ddof=1)):
+        a, b = acc(), acc()
+        a.add(QuantityArray(values[:50], "m"))
+        a.add(QuantityArray(values[50:] * 100, "cm"))
+        b.update(Quantity(v, "m") for v in values)
+        assert a.count == b.count == 101
+        assert math.isclose(a.result("m").value, b.result("m").value, rel_tol=1e-12)
+    h = Histogram([0, 1, 2, 5], "m")
+    h.add(QuantityArray(values, "m"))
+    assert h.result() == [20, 20, 60] and h.overflow == 1
+
+
+def test_update_accepts_arrays_mixed_with_scalars():
+    np = pytest.importorskip("numpy")
+    from SI import QuantityArray
+    values = np.linspace(0, 5, 101)
+    mixed = [QuantityArray(values[:50], "m"), Quantity(values[50], "m"), QuantityArray(values[51:] * 100, "cm")]
+    for acc in (Sum, Mean, Min, Max, lambda: Variance(ddof=1)):
+        a, b = acc().update(mixed), acc().update(Quantity(v, "m") for v in values)
+        assert a.count == b.count == 101
+        assert math.isclose(a.result("m").value, b.result("m").value, rel_tol=1e-12)
+    h = Histogram([0, 1, 2, 5], "m").update(mixed)
+    assert h.result() == [20, 20, 60] and h.overflow == 1 and h.count == 101
@@ -0,0 +1,50 @@
+import pytest
+
+from SI import Quantity, QuantityWriter, Unit, UnitSystem, save_quantities
+
+np = pytest.importorskip("numpy")
+from SI import QuantityArray, load_quantities  # noqa: E402
+
+
+def test_roundtrip_is_memory_mapped(tmp_path):
+    path = tmp_path / "v.siq"
+    save_quantities(str(path), QuantityArray(np.arange(5.0), "mV"))
+    loaded = load_quantities(str(path))
+    assert loaded.unit is Unit("mV")
+    assert loaded.value.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert isinstance(loaded.value.base, np.memmap) or isinstance(loaded.value, np.memmap)
+    assert not loaded.value.flags.writeable
+
+
+def test_streaming_append_converts_to_file_unit(tmp_path):
+    path = str(tmp_path / "len.siq")
+    with QuantityWriter(path, "m") as writer:
+        writer.write([1.0, 2.0])
+        writer.write(QuantityArray([300.0], "cm"))
+    with QuantityWriter(path, append=True) as writer:
+        writer.write([Quantity(1, "km"), Quantity(5, "mm")])
+    with open(path, "ab") as f:
+        f.write(b"\x00\x01\x02")      # 中断的写入
+    assert load_quantities(path, mmap=False).value.tolist() == [1.0, 2.0, 3.0, 1000.0, 0.005]
+    with pytest.raises(ValueError):
+        QuantityWriter(path, "s", append=True)
+
+
+def test_unknown_unit_restored_from_header(tmp_path):
+    path = str(tmp_path / "custom.siq")
+    UnitSystem.define_unit("furlong", 201.168, {"m": 1}, english=True)
+    try:
+        unit = Unit("furlong")
+        save_quantities(path, [1.0, 2.0], unit)
+    finally:
+        del UnitSystem.English_UNITS["furlong"]
+        UnitSystem.invalidate()
+    loaded = load_quantities(path)
+    assert loaded.unit.name == "furlong" and loaded.unit == unit
+    assert loaded.to("m").value.tolist() == [201.168, 402.336]
+
+
+def test_empty_file(tmp_path):
+    path = str(tmp_path / "empty.siq")
+    QuantityWriter(path, "s").close()
+    assert len(load_quantities(path)) == 0
@@ -0,0 +1,95 @@
+import pickle
+
+import pytest
+
+from SI import Unit, UnitSystem
+
+
+def test_parse_cache_interns_units():
+    Unit.cache_clear()
+    a = Unit("km/h")
+    b = Unit(" km / h ")
+    assert a is b
+    info = Unit.cache_info()
+    assert info.hits >= 1 and info.currsize >= 1
+
+
+def test_parse_cache_eviction_and_resize():
+    Unit.cache_clear()
+    Unit.set_cache_size(2)
+    try:
+        Unit("m"), Unit("s"), Unit("kg")
+        info = Unit.cache_info()
+        assert info.currsize == 2 and info.evictions >= 1
+        Unit.set_cache_size(0)
+        assert Unit("m") is not Unit("m")
+    finally:
+        Unit.set_cache_size(1024)
+        Unit.cache_clear()
+
+
+def test_parse_errors_are_not_cached():
+    Unit.cache_clear()
+    with pytest.raises(ValueError):
+        Unit("xyz")
+    assert Unit.cache_info().currsize == 0
+
+
+def test_whitespace_between_symbols_is_not_removed():
+    # 只规范化运算符两侧的空白，"m s" 不是 "ms"
+    for expr in ("m s", "k m", "J / mol K"):
+        with pytest.raises(ValueError):
+            Unit(expr)
+    assert Unit("J / (mol · K) ") is Unit("J/(mol·K)")
+
+
+def test_to_derived_unit_uses_named_units():
+    factor, unit = (Unit("kg") * Unit("m^2") / Unit("s^2")).to_derived_unit()
+    assert unit.name == "J" and factor == 1.0
+    factor, unit = (Unit("V") / Unit("kOhm")).to_derived_unit()
+    assert unit.name == "A" and factor == 1e-3
+    # 无对应命名单位时，同量纲的单位合并到最先出现的那个
+    factor, unit = (Unit("cm") * Unit("mm")).to_derived_unit()
+    assert unit.name == "cm^2" and abs(factor - 0.1) < 1e-15
+    factor, unit = (Unit("km") / Unit("h") * Unit("min")).to_derived_unit()
+    assert unit.name == "m" and abs(factor - 1000 / 60) < 1e-12
+
+
+def test_units_are_immutable_and_hashable():
+    u = Unit("km/h")
+    with pytest.raises(AttributeError):
+        u.factor = 2.0
+    with pytest.raises(AttributeError):
+        u.extra = 1
+    assert Unit("N*m") == Unit("J") and hash(Unit("N*m")) == hash(Unit("J"))
+    assert {Unit("J"): 1}[Unit("N*m")] == 1
+    assert Unit("km") != Unit("m")
+
+
+def test_converter_is_cached_and_checks_dimensions():
+    c = Unit.converter("km/h", "m/s")
+    assert c(36) == 10.0
+    assert c.factor == Unit("km/h").convert_to("m/s")
+    assert Unit.converter(Unit("km/h"), "m/s") is c
+    with pytest.raises(ValueError):
+        Unit.converter("km/h", "s")
+
+
+def test_pickle_reinterns_units():
+    u = Unit("kg*m^2/(A^2*s^3)")
+    data = pickle.dumps(u, pickle.HIGHEST_PROTOCOL)
+    assert pickle.loads(data) is u
+    assert b"_unitdict_raw" not in data and len(data) < 100
+    derived = Unit("m") / Unit("s")
+    assert pickle.loads(pickle.dumps(derived)) == derived
+
+
+def test_pickle_rebuilds_units_unknown_to_the_loader():
+    UnitSystem.register_unit("furlong", 201.168, {"m": 1}, english=True)
+    try:
+        data = pickle.dumps(Unit("furlong"))
+    finally:
+        del UnitSystem.English_UNITS["furlong"]
+        UnitSystem.invalidate()
+    u = pickle.loads(data)
+    assert u.name == "furlong" and u.factor == 201.168 and u.is_compatible("m")
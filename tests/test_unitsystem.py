@@ -0,0 +1,116 @@
+import pytest
+
+from SI import Quantity, Unit, UnitSystem
+
+
+@pytest.fixture
+def restore_tables():
+    derived = dict(UnitSystem.DERIVED_UNITS)
+    prefixes = dict(UnitSystem.PREFIXES)
+    aliases = dict(UnitSystem.UNIT_ALIASES)
+    yield
+    UnitSystem.UNIT_ALIASES = aliases
+    UnitSystem.DERIVED_UNITS.clear()
+    UnitSystem.DERIVED_UNITS.update(derived)
+    UnitSystem.PREFIXES.clear()
+    UnitSystem.PREFIXES.update(prefixes)
+    UnitSystem.invalidate()
+
+
+def test_lookup_prefixed_symbols():
+    assert UnitSystem.lookup('kOhm')[0] == 1000.0
+    assert UnitSystem.lookup('uF')[1] == UnitSystem.to_dimension({'kg': -1, 'm': -2, 's': 4, 'A': 2})
+    assert UnitSystem.lookup('min')[0] == 60          # 无词头单位优先
+    assert UnitSystem.lookup('mkg')[0] == 1e-3        # 嵌套词头回退
+    with pytest.raises(ValueError):
+        UnitSystem.lookup('xyz')
+
+
+def test_define_unit_updates_index_and_cache(restore_tables):
+    with pytest.raises(ValueError):
+        Unit("bar")
+    UnitSystem.define_unit('bar', 1e5, {'kg': 1, 'm': -1, 's': -2})
+    assert Unit("bar").convert_to("Pa") == 1e5
+    assert Unit("kbar").convert_to("Pa") == 1e8
+
+
+def test_define_prefix(restore_tables):
+    UnitSystem.lookup('m')
+    UnitSystem.define_prefix('c', 1e-2)
+    assert UnitSystem.lookup('cs')[0] == 1e-2
+    assert UnitSystem.lookup('cm')[0] == 0.01      # 已有的导出单位不受影响
+
+
+def test_register_alias(restore_tables):
+    UnitSystem.register_alias('Ω', 'Ohm')
+    UnitSystem.register_alias('litre', 'dm^3')
+    assert Unit("kΩ").convert_to("Ohm") == 1000.0
+    assert Unit("mlitre").convert_to("cm^3") == pytest.approx(1.0)
+    assert Unit("Ω*m").is_compatible("Ohm*m")
+    with pytest.raises(ValueError):
+        UnitSystem.register_alias('meter', 'xyz')
+    with pytest.raises(ValueError):
+        UnitSystem.register_alias('J', 'N*m')          # 已有的单位不能作别名
+    with pytest.raises(ValueError):
+        UnitSystem.register_alias('m/s', 'km/h')       # 别名必须是单个符号
+    with pytest.raises(ValueError):
+        UnitSystem.register_alias('km', 'mile')        # 带词头的符号也不能重新定义
+    assert Quantity(1, "km").to("m").value == 1000.0
+    UnitSystem.register_alias('Ω', 'kOhm')              # 已注册的别名可以修改目标
+    assert Unit("Ω").convert_to("Ohm") == 1000.0
+
+
+def test_registration_is_copy_on_write(restore_tables):
+    Unit("kOhm").convert_to("Ohm")
+    old, version, table = UnitSystem._registry, UnitSystem._version, UnitSystem.DERIVED_UNITS
+    UnitSystem.register_unit('bar', 1e5, {'kg': 1, 'm': -1, 's': -2})
+    # 旧的单位表和索引不被修改，持有它们的读取方不受影响
+    assert 'bar' not in table and 'bar' not in old.derived and 'kbar' not in old.symbols
+    assert UnitSystem._registry is not old and UnitSystem._version == version + 1
+    assert UnitSystem._registry.version == UnitSystem._version
+    assert 'bar' in UnitSystem.DERIVED_UNITS
+
+
+def test_concurrent_registration(restore_tables):
+    from concurrent.futures import ThreadPoolExecutor
+    names = [f"unit{chr(97 + i)}" for i in range(20)]
+
+    def read(_):
+        for _ in range(200):
+            assert Unit("km/h").convert_to("m/s") == pytest.approx(1 / 3.6)
+            assert UnitSystem.lookup('kOhm')[0] == 1000.0
+
+    def register(name):
+        UnitSystem.register_unit(name, 2.0, {'m': 1})
+
+    with ThreadPoolExecutor(8) as pool:
+        reads = [pool.submit(read, i) for i in range(8)]
+        list(pool.map(register, names))
+        for r in reads:
+            r.result()
+    for name in names:
+        assert Unit("k" + name).convert_to("m") == 2000.0
+
+
+def test_results_computed_against_an_old_registry_are_not_cached(restore_tables):
+    from SI.unit import _PARSE_CACHE
+    version = UnitSystem._version
+    _PARSE_CACHE.validate(version)
+    # 解析进行期间发布了新版本，且另一个读取方已经按新版本清空了缓存
+    UnitSystem.register_unit('bar', 1e5, {'kg': 1, 'm': -1, 's': -2})
+    _PARSE_CACHE.validate(UnitSystem._version)
+    _PARSE_CACHE.put("stale", Unit("m"), version)
+    assert "stale" not in _PARSE_CACHE
+    # 读到旧版本的线程也不会把缓存退回旧版本
+    _PARSE_CACHE.validate(version)
+    assert _PARSE_CACHE.version == UnitSystem._version
+
+
+def test_dimension_vectors_are_interned():
+    assert Unit("N*m").dim is Unit("J").dim
+    assert Unit("km/h").is_compatible("mph")
+    assert Unit("m/s").dim == (1, 0, -1, 0, 0, 0, 0)
+    assert (Unit("m") / Unit("m")).dim is UnitSystem.DIMENSIONLESS
+    assert Unit("kg*m^2/(A^2*s^3)").base_units == {'m': 2, 'kg': 1, 's': -3, 'A': -2}
+    with pytest.raises(ValueError):
+        UnitSystem.to_dimension({'J': 1})
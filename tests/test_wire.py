@@ -0,0 +1,50 @@
+import pytest
+
+from SI import Quantity, Unit
+from SI import wire
+
+
+def test_round_trip_reinterns_units():
+    quantities = [Quantity(i * 0.5, ("km/h", "kOhm", "J/(mol·K)")[i % 3]) for i in range(30)]
+    data = wire.dumps(quantities)
+    assert len(data) < wire.FRAME.size + 3 * (wire.UNIT.size + 16) + 30 * 10
+    decoded = wire.loads(data)
+    assert decoded == quantities
+    # 按规范名称重新驻留
+    assert decoded[0].unit is Unit("km/h") and decoded[2].unit is Unit("J/(K*mol)")
+
+
+def test_units_are_sent_once_per_stream():
+    encoder, decoder = wire.WireEncoder(), wire.WireDecoder()
+    first = encoder.encode([Quantity(1, "mm"), Quantity(2, "inch")])
+    second = encoder.encode([Quantity(3, "inch"), Quantity(4, "mm")])
+    assert len(second) == wire.FRAME.size + 2 * 10
+    assert [str(q) for q in decoder.decode(first)] == ["1.0 mm", "2.0 inch"]
+    assert [str(q) for q in decoder.decode(second)] == ["3.0 inch", "4.0 mm"]
+    with pytest.raises(ValueError):
+        wire.WireDecoder().decode(second)      # 缺少前一帧中的单位定义
+
+
+def test_columns_and_arrays():
+    pytest.importorskip("numpy")
+    from SI import QuantityArray
+    data = wire.dumps([QuantityArray([1.0, 2.0, 3.0], "mV"), Quantity(4, "V")])
+    values, ids, units = wire.WireDecoder().decode_columns(data)
+    assert list(values) == [1.0, 2.0, 3.0, 4.0] and list(ids) == [0, 0, 0, 1]
+    assert [u.name for u in units] == ["mV", "V"]
+    with pytest.raises(ValueError):
+        wire.loads(data[:-1])
+    with pytest.raises(ValueError):
+        wire.loads(b"XX" + data[2:])
+
+
+def test_equal_units_share_one_code_and_fractional_dimensions():
+    encoder, decoder = wire.WireEncoder(), wire.WireDecoder()
+    for _ in range(5):
+        # 每帧都是新建的单位对象
+        frame = encoder.encode([Quantity(1, Unit("km", 1000.0, {"m": 1}))])
+        decoder.decode(frame)
+    assert len(encoder._codes) == 1 and len(frame) == wire.FRAME.size + 10
+    root = Quantity(4, Unit("cm") ** 0.5)
+    (decoded,) = wire.loads(wire.dumps([root]))
+    assert decoded == root and decoded.unit.dim == root.unit.dim